@@ -0,0 +1,442 @@
+# ===================================================================
+# benchmark_n8n.py
+# Mede desempenho das automacoes contra um servidor n8n falso local
+# ===================================================================
+#
+# Sobe um servidor HTTP em 127.0.0.1 que imita os webhooks do n8n (com
+# latencia, erros 500 e respostas 429 configuraveis), executa as funcoes
+# de "exemplos para atividades n8n.py", GitHubAutoUpload.criar_zip e o
+# tempo de inicializacao do cli_n8n.py e grava vazao, percentis de
+# latencia, pico de memoria e as metricas internas (registro.METRICAS)
+# em JSON.
+#
+# Uso:
+#   python benchmark_n8n.py --saida resultados_benchmark.json
+#   python benchmark_n8n.py --latencia-ms 50 --taxa-429 0.05 --cenarios slack csv
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import functools
+import platform
+import tempfile
+import threading
+import statistics
+import tracemalloc
+import subprocess
+from datetime import datetime
+from contextlib import redirect_stdout, contextmanager, ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from registro import METRICAS
+from cli_n8n import carregar_exemplos
+
+PASTA_BASE = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_CLI = os.path.join(PASTA_BASE, "cli_n8n.py")
+
+CENARIOS = ("slack", "csv", "monitor", "relatorio", "zip", "cli")
+
+
+class ServidorN8nFalso:
+    """Servidor HTTP local que responde como um webhook do n8n"""
+    
+    def __init__(self, latencia_ms=0, jitter_ms=0, taxa_erro=0.0, taxa_429=0.0, seed=42):
+        """
+        Args:
+            latencia_ms: Atraso fixo de cada resposta
+            jitter_ms: Atraso aleatorio adicional (0 ate jitter_ms)
+            taxa_erro: Fracao das requisicoes respondidas com 500
+            taxa_429: Fracao das requisicoes respondidas com 429 (rate limit)
+            seed: Semente do gerador aleatorio (resultados reproduziveis)
+        """
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.taxa_erro = taxa_erro
+        self.taxa_429 = taxa_429
+        self.aleatorio = random.Random(seed)
+        self.trava = threading.Lock()
+        self.contadores = {"total": 0, "200": 0, "429": 0, "500": 0}
+        self.servidor = None
+        self.thread = None
+    
+    @property
+    def url(self):
+        host, porta = self.servidor.server_address
+        return f"http://{host}:{porta}"
+    
+    def _sortear(self):
+        """Decide atraso e status da proxima resposta"""
+        with self.trava:
+            atraso = self.latencia_ms + self.aleatorio.uniform(0, self.jitter_ms)
+            sorteio = self.aleatorio.random()
+        
+        if sorteio < self.taxa_429:
+            status = 429
+        elif sorteio < self.taxa_429 + self.taxa_erro:
+            status = 500
+        else:
+            status = 200
+        return atraso / 1000, status
+    
+    def _registrar(self, status):
+        with self.trava:
+            self.contadores["total"] += 1
+            self.contadores[str(status)] += 1
+    
+    def iniciar(self):
+        servidor_falso = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _responder(self):
+                tamanho = int(self.headers.get("Content-Length") or 0)
+                if tamanho:
+                    self.rfile.read(tamanho)
+                
+                atraso, status = servidor_falso._sortear()
+                if atraso:
+                    time.sleep(atraso)
+                servidor_falso._registrar(status)
+                
+                corpo = b'[]' if status == 200 else b'{"erro": "simulado"}'
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(corpo)
+            
+            do_GET = _responder
+            do_POST = _responder
+            
+            def log_message(self, formato, *args):
+                pass  # sem log por requisicao
+        
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.servidor.daemon_threads = True
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+def percentis(valores):
+    """Retorna p50, p90, p99, minimo e maximo em milissegundos"""
+    if not valores:
+        return None
+    
+    ms = sorted(valor * 1000 for valor in valores)
+    if len(ms) > 1:
+        cortes = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p90, p99 = cortes[49], cortes[89], cortes[98]
+    else:
+        p50 = p90 = p99 = ms[0]
+    
+    return {
+        "p50": round(p50, 3),
+        "p90": round(p90, 3),
+        "p99": round(p99, 3),
+        "min": round(ms[0], 3),
+        "max": round(ms[-1], 3)
+    }
+
+
+@contextmanager
+def cronometrar_chamadas(alvo, atributo, latencias):
+    """
+    Substitui alvo.atributo por uma versao que anota a duracao de cada chamada
+    
+    Args:
+        alvo: Modulo ou classe (ex: requests.sessions.Session)
+        atributo: Nome da funcao ou metodo (ex: "request")
+        latencias: Lista que recebe as duracoes em segundos
+    """
+    original = getattr(alvo, atributo)
+    
+    @functools.wraps(original)
+    def cronometrada(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            latencias.append(time.perf_counter() - inicio)
+    
+    setattr(alvo, atributo, cronometrada)
+    try:
+        yield latencias
+    finally:
+        setattr(alvo, atributo, original)
+
+
+def medir(nome, funcao, operacoes, servidor=None, chamadas_medidas=()):
+    """
+    Executa um cenario medindo tempo, memoria e requisicoes ao servidor
+    
+    O cenario roda duas vezes: a primeira mede tempo e latencias e a
+    segunda so o pico de memoria (o tracemalloc deixa o codigo bem mais
+    lento e distorceria a vazao).
+    
+    Args:
+        nome: Nome do cenario
+        funcao: Funcao sem argumentos; pode retornar a lista de latencias
+                por operacao (em segundos)
+        operacoes: Quantidade de operacoes do cenario (para a vazao)
+        servidor: ServidorN8nFalso usado (opcional)
+        chamadas_medidas: Pares (objeto, atributo) cronometrados a cada
+                          chamada, usados como latencia quando a funcao
+                          nao retorna as suas (ex: cada requisicao HTTP)
+    
+    Returns:
+        Dicionario com as metricas do cenario
+    """
+    print(f"[BENCH] {nome}...", end=" ", flush=True)
+    antes = dict(servidor.contadores) if servidor else {}
+    latencias_chamadas = []
+    
+    with ExitStack() as pilha:
+        for alvo, atributo in chamadas_medidas:
+            pilha.enter_context(cronometrar_chamadas(alvo, atributo, latencias_chamadas))
+        inicio = time.perf_counter()
+        with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+            latencias = funcao()
+        duracao = time.perf_counter() - inicio
+    
+    resultado = {
+        "operacoes": operacoes,
+        "duracao_s": round(duracao, 4),
+        "vazao_ops_s": round(operacoes / duracao, 2) if duracao else None,
+        "latencia_ms": percentis(latencias or latencias_chamadas)
+    }
+    if servidor:
+        resultado["requisicoes"] = {
+            chave: servidor.contadores[chave] - antes[chave] for chave in servidor.contadores
+        }
+    
+    # Segunda execucao so para o pico de memoria (fora das metricas internas)
+    metricas_ativas = METRICAS.ativo
+    METRICAS.ativo = False
+    tracemalloc.start()
+    try:
+        with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+            funcao()
+        _, pico_memoria = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        METRICAS.ativo = metricas_ativas
+    resultado["pico_memoria_kb"] = round(pico_memoria / 1024, 1)
+    
+    print(f"{resultado['vazao_ops_s']} ops/s")
+    return resultado
+
+
+def cronometrar(chamadas):
+    """Executa cada chamada e retorna a lista de duracoes"""
+    latencias = []
+    for chamada in chamadas:
+        inicio = time.perf_counter()
+        chamada()
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+def medir_inicializacao(comando, repeticoes):
+    """
+    Executa o comando em um interpretador novo varias vezes (como o cron faz)
+    
+    Returns:
+        Percentis do tempo total de cada execucao
+    """
+    latencias = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        latencias.append(time.perf_counter() - inicio)
+    return percentis(latencias)
+
+
+def criar_arvore_sintetica(pasta, quantidade, seed=42):
+    """
+    Cria uma arvore de arquivos para o benchmark do ZIP
+    
+    Mistura textos compressiveis, binarios aleatorios e "imagens"
+    (extensao .jpg) em subpastas, com tamanhos de 1 KB a 256 KB.
+    """
+    aleatorio = random.Random(seed)
+    total_bytes = 0
+    
+    for i in range(quantidade):
+        subpasta = os.path.join(pasta, f"dir_{i % 20:02d}", f"sub_{i % 7}")
+        os.makedirs(subpasta, exist_ok=True)
+        tamanho = aleatorio.choice((1, 4, 16, 64, 256)) * 1024
+        
+        tipo = i % 3
+        if tipo == 0:
+            linha = f"linha {i} texto repetido para compressao\n".encode()
+            dados = (linha * (tamanho // len(linha) + 1))[:tamanho]
+            nome = f"arquivo_{i}.txt"
+        elif tipo == 1:
+            dados = aleatorio.randbytes(tamanho)
+            nome = f"arquivo_{i}.bin"
+        else:
+            dados = aleatorio.randbytes(tamanho)
+            nome = f"foto_{i}.jpg"
+        
+        with open(os.path.join(subpasta, nome), 'wb') as f:
+            f.write(dados)
+        total_bytes += tamanho
+    
+    return total_bytes
+
+
+def executar_benchmark(cenarios=CENARIOS, chamadas=200, linhas_csv=1000, apis=5, ciclos=20,
+                       arquivos_zip=500, latencia_ms=0, jitter_ms=0, taxa_erro=0.0, taxa_429=0.0, seed=42,
+                       repeticoes_cli=20):
+    """
+    Executa os cenarios escolhidos e retorna o resultado completo
+    
+    Returns:
+        Dicionario pronto para ser gravado em JSON
+    """
+    servidor = ServidorN8nFalso(latencia_ms, jitter_ms, taxa_erro, taxa_429, seed).iniciar()
+    pasta_temp = tempfile.mkdtemp(prefix="bench_n8n_")
+    resultados = {}
+    
+    try:
+        exemplos = None
+        if set(cenarios) & {"slack", "csv", "monitor", "relatorio"}:
+            try:
+                exemplos = carregar_exemplos()
+                import requests.sessions
+                # Cada requisicao (requests.get/post) e cronometrada
+                requisicoes_http = [(requests.sessions.Session, "request")]
+            except ImportError as e:
+                print(f"[AVISO] Cenarios HTTP ignorados: {str(e)} (instale 'requests')")
+        
+        if exemplos and "slack" in cenarios:
+            url = f"{servidor.url}/webhook/slack-notification"
+            resultados["slack"] = medir("slack", lambda: cronometrar(
+                [lambda: exemplos.enviar_slack("#bench", "Mensagem de teste", "info", webhook_url=url)] * chamadas
+            ), chamadas, servidor)
+        
+        if exemplos and "csv" in cenarios:
+            caminho_csv = os.path.join(pasta_temp, "dados.csv")
+            with open(caminho_csv, 'w', newline='', encoding='utf-8') as f:
+                escritor = csv.writer(f)
+                escritor.writerow(["id", "nome", "email", "departamento"])
+                for i in range(linhas_csv):
+                    escritor.writerow([i, f"Funcionario {i}", f"func{i}@exemplo.com", "Patrimonio"])
+            url = f"{servidor.url}/webhook/importar-dados"
+            resultados["csv"] = medir("csv", lambda: exemplos.processar_csv(caminho_csv, url) and None,
+                                      linhas_csv, servidor, requisicoes_http)
+        
+        if exemplos and "monitor" in cenarios:
+            lista_apis = [(f"API {i}", f"{servidor.url}/health/{i}") for i in range(apis)]
+            url = f"{servidor.url}/webhook/status-api"
+            resultados["monitor"] = medir("monitor", lambda: exemplos.monitorar_multiplas_apis(
+                lista_apis, intervalo=0, webhook_url=url, max_ciclos=ciclos
+            ), apis * ciclos, servidor, requisicoes_http)
+        
+        if exemplos and "relatorio" in cenarios:
+            url = f"{servidor.url}/webhook/enviar-email"
+            dados = {"concluidas": 12, "pendentes": 5, "em_andamento": 3, "observacoes": "Benchmark"}
+            resultados["relatorio"] = medir("relatorio", lambda: cronometrar(
+                [lambda: exemplos.enviar_relatorio_email(
+                    ["a@exemplo.com", "b@exemplo.com"], "Relatorio", dados, webhook_url=url
+                )] * chamadas
+            ), chamadas, servidor)
+        
+        if "zip" in cenarios:
+            import github_auto_upload
+            from github_auto_upload import GitHubAutoUpload
+            
+            pasta_arvore = os.path.join(pasta_temp, "arvore")
+            pasta_repo = os.path.join(pasta_temp, "repo")
+            os.makedirs(pasta_repo)
+            total_bytes = criar_arvore_sintetica(pasta_arvore, arquivos_zip, seed)
+            
+            uploader = GitHubAutoUpload(pasta_repo)
+            # Latencia = tempo para gravar cada arquivo no ZIP
+            resultados["zip"] = medir("zip", lambda: uploader.criar_zip(pasta_arvore, "bench.zip") and None,
+                                      arquivos_zip, chamadas_medidas=[(github_auto_upload, "escrever_no_zip")])
+            resultados["zip"]["mb_origem"] = round(total_bytes / (1024 * 1024), 2)
+            resultados["zip"]["mb_zip"] = round(
+                os.path.getsize(os.path.join(pasta_repo, "bench.zip")) / (1024 * 1024), 2
+            )
+            resultados["zip"]["vazao_mb_s"] = round(
+                resultados["zip"]["mb_origem"] / resultados["zip"]["duracao_s"], 2
+            )
+    
+        if "cli" in cenarios:
+            # Tempo de inicializacao: interpretador vazio, --help e um envio simples
+            print("[BENCH] cli...", end=" ", flush=True)
+            url = f"{servidor.url}/webhook/slack-notification"
+            resultados["cli"] = {
+                "repeticoes": repeticoes_cli,
+                "python_vazio_ms": medir_inicializacao([sys.executable, "-c", "pass"], repeticoes_cli),
+                "help_ms": medir_inicializacao([sys.executable, ARQUIVO_CLI, "--help"], repeticoes_cli),
+                "slack_ms": medir_inicializacao(
+                    [sys.executable, ARQUIVO_CLI, "slack", "#bench", "Teste", "--webhook-url", url],
+                    repeticoes_cli
+                )
+            }
+            print(f"--help p50 {resultados['cli']['help_ms']['p50']} ms")
+    
+    finally:
+        servidor.parar()
+        shutil.rmtree(pasta_temp, ignore_errors=True)
+    
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {
+            "chamadas": chamadas, "linhas_csv": linhas_csv, "apis": apis, "ciclos": ciclos,
+            "arquivos_zip": arquivos_zip, "latencia_ms": latencia_ms, "jitter_ms": jitter_ms,
+            "taxa_erro": taxa_erro, "taxa_429": taxa_429, "seed": seed, "repeticoes_cli": repeticoes_cli
+        },
+        "cenarios": resultados,
+        "metricas": METRICAS.snapshot()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das automacoes n8n com servidor local falso")
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=list(CENARIOS))
+    parser.add_argument("--chamadas", type=int, default=200, help="Chamadas nos cenarios slack e relatorio")
+    parser.add_argument("--linhas-csv", type=int, default=1000)
+    parser.add_argument("--apis", type=int, default=5, help="APIs monitoradas no cenario monitor")
+    parser.add_argument("--ciclos", type=int, default=20, help="Ciclos do cenario monitor")
+    parser.add_argument("--arquivos-zip", type=int, default=500, help="Arquivos da arvore sintetica")
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fracao de respostas 500")
+    parser.add_argument("--taxa-429", type=float, default=0.0, help="Fracao de respostas 429")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeticoes-cli", type=int, default=20, help="Execucoes por comando no cenario cli")
+    parser.add_argument("--saida", default="resultados_benchmark.json", help="Arquivo JSON de resultados")
+    args = parser.parse_args(argv)
+    
+    resultado = executar_benchmark(
+        cenarios=args.cenarios, chamadas=args.chamadas, linhas_csv=args.linhas_csv, apis=args.apis,
+        ciclos=args.ciclos, arquivos_zip=args.arquivos_zip, latencia_ms=args.latencia_ms,
+        jitter_ms=args.jitter_ms, taxa_erro=args.taxa_erro, taxa_429=args.taxa_429, seed=args.seed,
+        repeticoes_cli=args.repeticoes_cli
+    )
+    
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2)
+    
+    print(f"\n[OK] Resultados gravados em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
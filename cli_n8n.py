@@ -0,0 +1,381 @@
+# ===================================================================
+# cli_n8n.py
+# Ponto de entrada unico (nao interativo) para as automacoes n8n
+# ===================================================================
+#
+# Subcomandos:
+#   slack       Envia notificacao para o Slack
+#   csv-import  Envia as linhas de um CSV para o n8n
+#   monitor     Monitora APIs e envia os status
+#   schedule    Agenda uma tarefa com lembretes
+#   report      Envia relatorio por email
+#   backup      Compacta e envia arquivos para o GitHub
+#
+# Configuracao (da maior para a menor prioridade):
+#   1. Argumentos da linha de comando
+#   2. Variaveis de ambiente N8N_<SUBCOMANDO>_<OPCAO>
+#      (ex: N8N_SLACK_WEBHOOK_URL, N8N_BACKUP_REPOSITORIO)
+#   3. Arquivo JSON (--config ou N8N_CONFIG), com uma secao por subcomando:
+#      {"slack": {"webhook_url": "..."}, "backup": {"repositorio": "..."},
+#       "registro": {"nivel": "WARNING", "formato": "json"}}
+#
+# Os modulos pesados (requests, zipfile, git, etc) so sao importados
+# dentro do subcomando que precisa deles, entao '--help' abre rapido.
+# Subcomandos de um unico envio (slack, schedule, report) nem importam o
+# requests: passam aos exemplos um POST sobre urllib (ver postar_json).
+#
+# Exemplos:
+#   python cli_n8n.py slack "#alertas" "Uso de CPU acima de 80%" --nivel warning
+#   python cli_n8n.py csv-import funcionarios.csv --webhook-url https://seu-n8n.com/webhook/importar-dados
+#   python cli_n8n.py backup --repositorio C:/Repos/automacoes --pasta C:/Projetos/MeuProjeto --incremental
+
+import os
+import sys
+import json
+import argparse
+
+PASTA_BASE = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_EXEMPLOS = os.path.join(PASTA_BASE, "exemplos para atividades n8n.py")
+
+VALORES_VERDADEIROS = ("1", "true", "sim", "s", "yes", "y")
+
+
+class RespostaHttp:
+    """Resposta no formato usado pelos exemplos (status_code e text)"""
+    
+    def __init__(self, status_code, corpo):
+        self.status_code = status_code
+        self.text = corpo.decode('utf-8', 'replace')
+
+
+def postar_json(url, json=None, timeout=None):
+    """
+    POST com corpo JSON sobre urllib, no formato de requests.post
+    
+    Importar o requests leva mais tempo que um envio simples inteiro.
+    Erros de conexao/timeout sobem como excecoes do urllib.
+    
+    Returns:
+        RespostaHttp (respostas HTTP de erro tambem, como no requests)
+    """
+    # 'json' e o nome do argumento (como em requests.post), dai o alias
+    import json as json_mod
+    import urllib.error
+    import urllib.request
+    
+    corpo = json_mod.dumps(json).encode('utf-8')
+    requisicao = urllib.request.Request(url, data=corpo, method="POST")
+    requisicao.add_header("Content-Type", "application/json")
+    
+    try:
+        with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+            return RespostaHttp(resposta.status, resposta.read())
+    except urllib.error.HTTPError as e:
+        return RespostaHttp(e.code, e.read())
+
+
+def carregar_exemplos():
+    """Importa o arquivo de exemplos (o nome tem espacos, entao via importlib)"""
+    import importlib.util
+    
+    spec = importlib.util.spec_from_file_location("exemplos_n8n", ARQUIVO_EXEMPLOS)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def carregar_configuracao(caminho):
+    """Le o arquivo JSON de configuracao; retorna {} se nao informado"""
+    if not caminho:
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Opcoes:
+    """Resolve cada opcao: argumento > variavel de ambiente > arquivo > padrao"""
+    
+    def __init__(self, args, config, secao):
+        self.args = args
+        self.config = config.get(secao, {})
+        self.prefixo_env = f"N8N_{secao.upper().replace('-', '_')}_"
+    
+    def _bruto(self, chave):
+        valor = getattr(self.args, chave, None)
+        if valor not in (None, []):
+            return valor, "args"
+        valor = os.environ.get(self.prefixo_env + chave.upper())
+        if valor is not None:
+            return valor, "env"
+        if chave in self.config:
+            return self.config[chave], "config"
+        return None, None
+    
+    def texto(self, chave, padrao=None):
+        valor, _ = self._bruto(chave)
+        return padrao if valor is None else valor
+    
+    def numero(self, chave, padrao=None, tipo=float):
+        valor, _ = self._bruto(chave)
+        return padrao if valor is None else tipo(valor)
+    
+    def booleano(self, chave, padrao=False):
+        valor, origem = self._bruto(chave)
+        if valor is None:
+            return padrao
+        if origem == "env":
+            return valor.strip().lower() in VALORES_VERDADEIROS
+        return bool(valor)
+    
+    def lista(self, chave, padrao=None):
+        """Listas no ambiente sao separadas por virgula"""
+        valor, origem = self._bruto(chave)
+        if valor is None:
+            return padrao or []
+        if origem == "env":
+            return [item.strip() for item in valor.split(",") if item.strip()]
+        return list(valor)
+    
+    def exigir(self, chave):
+        valor = self.texto(chave)
+        if valor in (None, ""):
+            raise SystemExit(f"[ERRO] Opcao obrigatoria ausente: --{chave.replace('_', '-')} "
+                             f"(ou {self.prefixo_env}{chave.upper()})")
+        return valor
+
+
+def _webhook(opcoes):
+    """Repassa webhook_url so quando configurado (senao vale o padrao da funcao)"""
+    url = opcoes.texto("webhook_url")
+    return {"webhook_url": url} if url else {}
+
+
+# ===================================================================
+# SUBCOMANDOS
+# ===================================================================
+def comando_slack(args, config):
+    opcoes = Opcoes(args, config, "slack")
+    exemplos = carregar_exemplos()
+    return exemplos.enviar_slack(
+        opcoes.exigir("canal"), opcoes.exigir("mensagem"), opcoes.texto("nivel", "info"),
+        enviar_post=postar_json, **_webhook(opcoes)
+    )
+
+
+def comando_csv_import(args, config):
+    opcoes = Opcoes(args, config, "csv-import")
+    arquivo_csv = opcoes.exigir("arquivo")
+    webhook_url = opcoes.exigir("webhook_url")
+    if not os.path.exists(arquivo_csv):
+        print(f"[ERRO] Arquivo nao encontrado: {arquivo_csv}")
+        return False
+    
+    # processar_csv devolve (0, 0) se nao conseguir ler, igual a um CSV
+    # vazio; por isso a leitura (e o UTF-8) e conferida antes
+    try:
+        with open(arquivo_csv, 'r', encoding='utf-8') as f:
+            while f.read(1024 * 1024):
+                pass
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"[ERRO] Nao foi possivel ler {arquivo_csv}: {str(e)}")
+        return False
+    
+    exemplos = carregar_exemplos()
+    _, erros = exemplos.processar_csv(arquivo_csv, webhook_url)
+    return erros == 0
+
+
+def comando_monitor(args, config):
+    opcoes = Opcoes(args, config, "monitor")
+    apis = []
+    for item in opcoes.lista("api"):
+        nome, separador, url = item.partition("=")
+        if not separador:
+            raise SystemExit(f"[ERRO] API invalida '{item}'. Use NOME=URL")
+        apis.append((nome.strip(), url.strip()))
+    if not apis:
+        raise SystemExit("[ERRO] Informe ao menos uma --api NOME=URL")
+    
+    exemplos = carregar_exemplos()
+    exemplos.monitorar_multiplas_apis(
+        apis,
+        intervalo=opcoes.numero("intervalo", 60),
+        max_ciclos=opcoes.numero("ciclos", None, int),
+        **_webhook(opcoes)
+    )
+    return True
+
+
+def comando_schedule(args, config):
+    opcoes = Opcoes(args, config, "schedule")
+    exemplos = carregar_exemplos()
+    return exemplos.agendar_tarefa(
+        opcoes.exigir("titulo"), opcoes.exigir("data_hora"), opcoes.exigir("responsavel"),
+        prioridade=opcoes.texto("prioridade", "media"), enviar_post=postar_json, **_webhook(opcoes)
+    )
+
+
+def comando_report(args, config):
+    opcoes = Opcoes(args, config, "report")
+    destinatarios = opcoes.lista("destinatario")
+    if not destinatarios:
+        raise SystemExit("[ERRO] Informe ao menos um --destinatario")
+    
+    caminho_dados = opcoes.texto("dados")
+    dados = carregar_configuracao(caminho_dados) if caminho_dados else {}
+    for chave in ("concluidas", "pendentes", "em_andamento"):
+        valor = opcoes.numero(chave, None, int)
+        if valor is not None:
+            dados[chave] = valor
+    observacoes = opcoes.texto("observacoes")
+    if observacoes:
+        dados["observacoes"] = observacoes
+    
+    exemplos = carregar_exemplos()
+    return exemplos.enviar_relatorio_email(
+        destinatarios, opcoes.exigir("assunto"), dados, enviar_post=postar_json, **_webhook(opcoes)
+    )
+
+
+def comando_backup(args, config):
+    opcoes = Opcoes(args, config, "backup")
+    from github_auto_upload import GitHubAutoUpload, PoliticaRetencao
+    
+    retencao = None
+    manter_ultimos = opcoes.numero("manter_ultimos", None, int)
+    if manter_ultimos:
+        retencao = PoliticaRetencao(
+            ultimos=manter_ultimos,
+            diarios_dias=opcoes.numero("diarios_dias", 0, int),
+            semanais_dias=opcoes.numero("semanais_dias", 0, int),
+            pasta_arquivo=opcoes.texto("pasta_arquivo")
+        )
+    
+    uploader = GitHubAutoUpload(
+        repositorio_local=opcoes.exigir("repositorio"),
+        branch=opcoes.texto("branch", "main"),
+        retencao=retencao
+    )
+    pasta_origem = opcoes.texto("pasta")
+    limites = {}
+    for chave in ("tamanho_medio_chunk", "tamanho_maximo_chunk", "nova_base_a_cada_dias", "max_deltas"):
+        valor = opcoes.numero(chave, None, int)
+        if valor:
+            limites[chave] = valor
+    return bool(uploader.upload_completo(
+        pasta_origem=pasta_origem,
+        arquivos=opcoes.lista("arquivo"),
+        mensagem_commit=opcoes.texto("mensagem"),
+        criar_zip_backup=bool(pasta_origem),
+        incremental=opcoes.booleano("incremental"),
+        commit_direto=opcoes.booleano("commit_direto"),
+        dividir_chunks=opcoes.booleano("chunks"),
+        webhook_relatorio=opcoes.texto("webhook_relatorio"),
+        nova_base=opcoes.booleano("nova_base"),
+        **limites
+    ))
+
+
+# ===================================================================
+# LINHA DE COMANDO
+# ===================================================================
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli_n8n",
+        description="Automacoes n8n: notificacoes, importacao, monitoramento, relatorios e backup"
+    )
+    parser.add_argument("--config", help="Arquivo JSON de configuracao (padrao: $N8N_CONFIG)")
+    parser.add_argument("--nivel-log", help="DEBUG, INFO, WARNING, ERROR ou SILENCIOSO")
+    parser.add_argument("--formato-log", choices=("texto", "json"))
+    parser.add_argument("--amostragem", type=int, help="Registra 1 a cada N logs por item")
+    subparsers = parser.add_subparsers(dest="comando", metavar="COMANDO", required=True)
+    
+    sub = subparsers.add_parser("slack", help="Envia notificacao para o Slack")
+    sub.add_argument("canal", nargs="?")
+    sub.add_argument("mensagem", nargs="?")
+    sub.add_argument("--nivel", choices=("info", "warning", "error", "success"))
+    sub.add_argument("--webhook-url", dest="webhook_url")
+    sub.set_defaults(funcao=comando_slack)
+    
+    sub = subparsers.add_parser("csv-import", help="Envia as linhas de um CSV para o n8n")
+    sub.add_argument("arquivo", nargs="?")
+    sub.add_argument("--webhook-url", dest="webhook_url")
+    sub.set_defaults(funcao=comando_csv_import)
+    
+    sub = subparsers.add_parser("monitor", help="Monitora APIs e envia os status para o n8n")
+    sub.add_argument("--api", action="append", default=[], help="NOME=URL (pode repetir)")
+    sub.add_argument("--intervalo", type=float, help="Segundos entre verificacoes (padrao: 60)")
+    sub.add_argument("--ciclos", type=int, help="Encerra apos N verificacoes (padrao: sem limite)")
+    sub.add_argument("--webhook-url", dest="webhook_url")
+    sub.set_defaults(funcao=comando_monitor)
+    
+    sub = subparsers.add_parser("schedule", help="Agenda uma tarefa com lembretes")
+    sub.add_argument("titulo", nargs="?")
+    sub.add_argument("data_hora", nargs="?", help="YYYY-MM-DD HH:MM")
+    sub.add_argument("responsavel", nargs="?")
+    sub.add_argument("--prioridade", choices=("baixa", "media", "alta"))
+    sub.add_argument("--webhook-url", dest="webhook_url")
+    sub.set_defaults(funcao=comando_schedule)
+    
+    sub = subparsers.add_parser("report", help="Envia relatorio por email")
+    sub.add_argument("--destinatario", action="append", default=[], help="Email (pode repetir)")
+    sub.add_argument("--assunto")
+    sub.add_argument("--dados", help="Arquivo JSON com os dados do relatorio")
+    sub.add_argument("--concluidas", type=int)
+    sub.add_argument("--pendentes", type=int)
+    sub.add_argument("--em-andamento", dest="em_andamento", type=int)
+    sub.add_argument("--observacoes")
+    sub.add_argument("--webhook-url", dest="webhook_url")
+    sub.set_defaults(funcao=comando_report)
+    
+    sub = subparsers.add_parser("backup", help="Compacta e envia arquivos para o GitHub")
+    sub.add_argument("--repositorio", help="Repositorio git local")
+    sub.add_argument("--branch")
+    sub.add_argument("--pasta", help="Pasta compactada em ZIP")
+    sub.add_argument("--arquivo", action="append", default=[], help="Arquivo individual (pode repetir)")
+    sub.add_argument("--mensagem", help="Mensagem do commit")
+    sub.add_argument("--incremental", action="store_true", default=None)
+    sub.add_argument("--nova-base", dest="nova_base", action="store_true", default=None,
+                     help="Inicia uma nova cadeia incremental")
+    sub.add_argument("--nova-base-a-cada-dias", dest="nova_base_a_cada_dias", type=int)
+    sub.add_argument("--max-deltas", dest="max_deltas", type=int)
+    sub.add_argument("--chunks", action="store_true", default=None, help="Backup em chunks deduplicados")
+    sub.add_argument("--tamanho-medio-chunk", dest="tamanho_medio_chunk", type=int,
+                     help="Bytes, potencia de 2 (padrao: 4 MB)")
+    sub.add_argument("--tamanho-maximo-chunk", dest="tamanho_maximo_chunk", type=int,
+                     help="Bytes (padrao: 32 MB)")
+    sub.add_argument("--commit-direto", dest="commit_direto", action="store_true", default=None)
+    sub.add_argument("--manter-ultimos", dest="manter_ultimos", type=int, help="Ativa a retencao")
+    sub.add_argument("--diarios-dias", dest="diarios_dias", type=int)
+    sub.add_argument("--semanais-dias", dest="semanais_dias", type=int)
+    sub.add_argument("--pasta-arquivo", dest="pasta_arquivo")
+    sub.add_argument("--webhook-relatorio", dest="webhook_relatorio")
+    sub.set_defaults(funcao=comando_backup)
+    
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    config = carregar_configuracao(args.config or os.environ.get("N8N_CONFIG"))
+    
+    registro_cfg = Opcoes(argparse.Namespace(
+        nivel=args.nivel_log, formato=args.formato_log, amostragem=args.amostragem
+    ), config, "registro")
+    if any(registro_cfg.texto(chave) is not None for chave in ("nivel", "formato", "amostragem")):
+        from registro import configurar_registro
+        configurar_registro(
+            nivel=registro_cfg.texto("nivel", "INFO"),
+            formato=registro_cfg.texto("formato", "texto"),
+            amostragem=registro_cfg.numero("amostragem", 1, int)
+        )
+    
+    try:
+        sucesso = args.funcao(args, config)
+    except KeyboardInterrupt:
+        return 130
+    return 0 if sucesso else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
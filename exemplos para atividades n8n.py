@@ -3,10 +3,10 @@
 # Envia notificacoes para o Slack via n8n
 # ===================================================================
 
-import requests
 from datetime import datetime
 
-def enviar_slack(canal, mensagem, nivel="info"):
+def enviar_slack(canal, mensagem, nivel="info", webhook_url="https://seu-n8n.com/webhook/slack-notification",
+                 enviar_post=None):
     """
     Envia mensagem para Slack via webhook n8n
     
@@ -14,10 +14,11 @@ def enviar_slack(canal, mensagem, nivel="info"):
         canal: Nome do canal (#geral, #alertas, etc)
         mensagem: Texto da mensagem
         nivel: info, warning, error, success
+        webhook_url: URL do webhook n8n
+        enviar_post: Funcao de POST (padrao: requests.post); recebe
+                     (url, json=...) e retorna algo com status_code
     """
     
-    webhook_url = "https://seu-n8n.com/webhook/slack-notification"
-    
     # Emojis por nivel
     emojis = {
         "info": ":information_source:",
@@ -34,8 +35,12 @@ def enviar_slack(canal, mensagem, nivel="info"):
         "usuario": "Sistema Automatico"
     }
     
+    if enviar_post is None:
+        import requests
+        enviar_post = requests.post
+    
     try:
-        response = requests.post(webhook_url, json=dados)
+        response = enviar_post(webhook_url, json=dados)
         
         if response.status_code == 200:
             print(f"[OK] Mensagem enviada para {canal}")
@@ -68,8 +73,10 @@ if __name__ == "__main__":
 
 import csv
 import json
-import requests
 from datetime import datetime
+from registro import obter_logger, log_item, METRICAS
+
+log_csv = obter_logger("csv")
 
 def processar_csv(arquivo_csv, webhook_url):
     """
@@ -78,8 +85,13 @@ def processar_csv(arquivo_csv, webhook_url):
     Args:
         arquivo_csv: Caminho do arquivo CSV
         webhook_url: URL do webhook n8n
+    
+    Returns:
+        Tupla (linhas_processadas, erros)
     """
     
+    import requests
+    
     print(f"[INICIO] Processando: {arquivo_csv}\n")
     
     linhas_processadas = 0
@@ -97,17 +109,21 @@ def processar_csv(arquivo_csv, webhook_url):
                 }
                 
                 try:
-                    response = requests.post(webhook_url, json=dados)
+                    with METRICAS.cronometro("csv.envio"):
+                        response = requests.post(webhook_url, json=dados)
                     
                     if response.status_code == 200:
-                        print(f"[OK] Linha {linhas_processadas + 1} processada")
+                        log_item(log_csv, "[OK] Linha %d processada", linhas_processadas + 1)
+                        METRICAS.incrementar("csv.linhas_ok")
                         linhas_processadas += 1
                     else:
-                        print(f"[ERRO] Linha {linhas_processadas + 1}: {response.status_code}")
+                        log_csv.error("[ERRO] Linha %d: %s", linhas_processadas + 1, response.status_code)
+                        METRICAS.incrementar("csv.erros")
                         erros += 1
                 
                 except Exception as e:
-                    print(f"[ERRO] Linha {linhas_processadas + 1}: {str(e)}")
+                    log_csv.error("[ERRO] Linha %d: %s", linhas_processadas + 1, str(e))
+                    METRICAS.incrementar("csv.erros")
                     erros += 1
         
         print(f"\n{'='*50}")
@@ -136,10 +152,10 @@ if __name__ == "__main__":
 # Agenda tarefas e envia lembretes via n8n
 # ===================================================================
 
-import requests
 from datetime import datetime, timedelta
 
-def agendar_tarefa(titulo, data_hora, responsavel, prioridade="media"):
+def agendar_tarefa(titulo, data_hora, responsavel, prioridade="media",
+                   webhook_url="https://seu-n8n.com/webhook/agendar-tarefa", enviar_post=None):
     """
     Agenda uma tarefa e configura lembretes
     
@@ -148,10 +164,11 @@ def agendar_tarefa(titulo, data_hora, responsavel, prioridade="media"):
         data_hora: Data/hora no formato "YYYY-MM-DD HH:MM"
         responsavel: Nome do responsavel
         prioridade: baixa, media, alta
+        webhook_url: URL do webhook n8n
+        enviar_post: Funcao de POST (padrao: requests.post); recebe
+                     (url, json=...) e retorna algo com status_code
     """
     
-    webhook_url = "https://seu-n8n.com/webhook/agendar-tarefa"
-    
     # Converter string para datetime
     try:
         dt = datetime.strptime(data_hora, "%Y-%m-%d %H:%M")
@@ -176,8 +193,12 @@ def agendar_tarefa(titulo, data_hora, responsavel, prioridade="media"):
         "criado_em": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     
+    if enviar_post is None:
+        import requests
+        enviar_post = requests.post
+    
     try:
-        response = requests.post(webhook_url, json=dados)
+        response = enviar_post(webhook_url, json=dados)
         
         if response.status_code == 200:
             print(f"[OK] Tarefa agendada com sucesso!")
@@ -222,9 +243,11 @@ if __name__ == "__main__":
 # Monitora disponibilidade de APIs e notifica n8n
 # ===================================================================
 
-import requests
 import time
 from datetime import datetime
+from registro import obter_logger, log_item, METRICAS
+
+log_monitor = obter_logger("monitor")
 
 def verificar_api(url, nome_api, timeout=10):
     """
@@ -234,6 +257,8 @@ def verificar_api(url, nome_api, timeout=10):
         dict com status da API
     """
     
+    import requests
+    
     try:
         inicio = time.time()
         response = requests.get(url, timeout=timeout)
@@ -267,36 +292,48 @@ def verificar_api(url, nome_api, timeout=10):
         }
 
 
-def monitorar_multiplas_apis(apis, intervalo=60):
+def monitorar_multiplas_apis(apis, intervalo=60, webhook_url="https://seu-n8n.com/webhook/status-api",
+                             max_ciclos=None):
     """
     Monitora multiplas APIs continuamente
     
     Args:
         apis: Lista de tuplas (nome, url)
         intervalo: Intervalo entre verificacoes em segundos
+        webhook_url: URL do webhook n8n que recebe os status
+        max_ciclos: Encerra apos esse numero de verificacoes (padrao: sem limite)
     """
     
-    webhook_url = "https://seu-n8n.com/webhook/status-api"
+    import requests
     
     print(f"[INICIO] Monitorando {len(apis)} APIs")
     print(f"Intervalo: {intervalo} segundos\n")
     
-    while True:
+    ciclos = 0
+    while max_ciclos is None or ciclos < max_ciclos:
         try:
             for nome, url in apis:
-                resultado = verificar_api(url, nome)
+                with METRICAS.cronometro("monitor.verificacao"):
+                    resultado = verificar_api(url, nome)
                 
                 # Exibir status
                 if resultado["status"] == "online":
-                    print(f"[OK] {nome}: {resultado['tempo_resposta_ms']}ms")
+                    log_item(log_monitor, "[OK] %s: %sms", nome, resultado["tempo_resposta_ms"], dados=resultado)
+                    METRICAS.incrementar("monitor.online")
                 else:
-                    print(f"[ERRO] {nome}: {resultado['status']}")
+                    log_monitor.warning("[ERRO] %s: %s", nome, resultado["status"], extra={"dados": resultado})
+                    METRICAS.incrementar("monitor.falhas")
                 
                 # Enviar para n8n
                 try:
-                    requests.post(webhook_url, json=resultado)
+                    with METRICAS.cronometro("monitor.envio"):
+                        requests.post(webhook_url, json=resultado)
                 except:
-                    pass
+                    METRICAS.incrementar("monitor.erros_envio")
+            
+            ciclos += 1
+            if max_ciclos is not None and ciclos >= max_ciclos:
+                break
             
             print(f"\nProxima verificacao em {intervalo}s...\n")
             time.sleep(intervalo)
@@ -322,7 +359,6 @@ if __name__ == "__main__":
 # Sincroniza eventos de calendario com n8n
 # ===================================================================
 
-import requests
 from datetime import datetime, timedelta
 
 def criar_evento_calendario(titulo, data_inicio, data_fim, descricao="", participantes=[]):
@@ -337,6 +373,8 @@ def criar_evento_calendario(titulo, data_inicio, data_fim, descricao="", partici
         participantes: Lista de emails dos participantes
     """
     
+    import requests
+    
     webhook_url = "https://seu-n8n.com/webhook/criar-evento"
     
     dados = {
@@ -373,6 +411,8 @@ def listar_proximos_eventos(dias=7):
     Lista eventos dos proximos N dias
     """
     
+    import requests
+    
     webhook_url = "https://seu-n8n.com/webhook/listar-eventos"
     
     data_inicio = datetime.now().strftime("%Y-%m-%d")
@@ -432,7 +472,6 @@ if __name__ == "__main__":
 # Gera e envia relatorios por email via n8n
 # ===================================================================
 
-import requests
 from datetime import datetime
 
 def gerar_relatorio_html(dados):
@@ -488,7 +527,8 @@ def gerar_relatorio_html(dados):
     return html
 
 
-def enviar_relatorio_email(destinatarios, assunto, dados_relatorio):
+def enviar_relatorio_email(destinatarios, assunto, dados_relatorio,
+                           webhook_url="https://seu-n8n.com/webhook/enviar-email", enviar_post=None):
     """
     Envia relatorio por email via n8n
     
@@ -496,10 +536,11 @@ def enviar_relatorio_email(destinatarios, assunto, dados_relatorio):
         destinatarios: Lista de emails
         assunto: Assunto do email
         dados_relatorio: Dicionario com dados do relatorio
+        webhook_url: URL do webhook n8n
+        enviar_post: Funcao de POST (padrao: requests.post); recebe
+                     (url, json=...) e retorna algo com status_code
     """
     
-    webhook_url = "https://seu-n8n.com/webhook/enviar-email"
-    
     html_relatorio = gerar_relatorio_html(dados_relatorio)
     
     dados = {
@@ -509,8 +550,12 @@ def enviar_relatorio_email(destinatarios, assunto, dados_relatorio):
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     
+    if enviar_post is None:
+        import requests
+        enviar_post = requests.post
+    
     try:
-        response = requests.post(webhook_url, json=dados)
+        response = enviar_post(webhook_url, json=dados)
         
         if response.status_code == 200:
             print(f"[OK] Relatorio enviado para {len(destinatarios)} destinatario(s)")
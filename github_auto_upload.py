@@ -4,22 +4,511 @@
 # ===================================================================
 
 import os
+import re
+import json
+import time
+import logging
+import zlib
+import hashlib
 import zipfile
+import tempfile
 import subprocess
-from datetime import datetime
+from datetime import datetime, timedelta
 import shutil
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+from registro import obter_logger, log_item, METRICAS
+
+log = obter_logger("upload")
+
+# Arquivo (dentro do repositorio) que guarda o estado dos backups incrementais
+NOME_MANIFESTO = "backup_manifesto.json"
+
+# Entrada especial dentro de cada ZIP delta com a lista de arquivos excluidos
+NOME_EXCLUSOES = "__backup_exclusoes__.json"
+
+
+# Extensoes de formatos ja compactados: deflate so gasta CPU nesses arquivos
+EXTENSOES_SEM_COMPRESSAO = {
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp3", ".mp4", ".m4a", ".mkv", ".avi", ".mov", ".webm", ".ogg",
+    ".pdf", ".docx", ".xlsx", ".pptx", ".jar", ".apk"
+}
+
+# Tamanho da amostra lida para testar se um arquivo comprime
+TAMANHO_AMOSTRA = 64 * 1024
+
+# Abaixo dessa proporcao (comprimido/original) vale a pena usar deflate
+LIMITE_COMPRESSAO = 0.9
+
+# Tamanho de bloco usado para copiar dados para dentro do ZIP
+TAMANHO_BLOCO_ZIP = 1024 * 1024
+
+
+def escolher_compressao(caminho_arquivo):
+    """
+    Escolhe o metodo de compressao do arquivo dentro do ZIP
+    
+    Usa a extensao quando ela ja indica um formato compactado; nos demais
+    casos comprime uma amostra do inicio do arquivo com zlib nivel 1 e so
+    usa deflate se a amostra encolher o suficiente.
+    
+    Args:
+        caminho_arquivo: Caminho do arquivo
+    
+    Returns:
+        zipfile.ZIP_STORED ou zipfile.ZIP_DEFLATED
+    """
+    extensao = os.path.splitext(caminho_arquivo)[1].lower()
+    if extensao in EXTENSOES_SEM_COMPRESSAO:
+        return zipfile.ZIP_STORED
+    
+    with open(caminho_arquivo, 'rb') as f:
+        amostra = f.read(TAMANHO_AMOSTRA)
+    
+    if len(amostra) < 512:
+        return zipfile.ZIP_DEFLATED
+    
+    if len(zlib.compress(amostra, 1)) / len(amostra) > LIMITE_COMPRESSAO:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def escrever_no_zip(zipf, caminho_arquivo, caminho_relativo, progresso=None):
+    """
+    Grava um arquivo no ZIP em blocos, com suporte a ZIP64
+    
+    O conteudo nunca e carregado inteiro em memoria e arquivos acima de
+    4 GB recebem cabecalho ZIP64 desde o inicio.
+    
+    Args:
+        zipf: zipfile.ZipFile aberto para escrita
+        caminho_arquivo: Caminho do arquivo no disco
+        caminho_relativo: Nome do arquivo dentro do ZIP
+        progresso: RelatorioProgresso para contabilizar bytes (opcional)
+    
+    Returns:
+        Metodo de compressao usado
+    """
+    info = zipfile.ZipInfo.from_file(caminho_arquivo, caminho_relativo)
+    info.compress_type = escolher_compressao(caminho_arquivo)
+    
+    with open(caminho_arquivo, 'rb') as origem, \
+            zipf.open(info, 'w', force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as destino:
+        for bloco in iter(lambda: origem.read(TAMANHO_BLOCO_ZIP), b''):
+            destino.write(bloco)
+            if progresso:
+                progresso.adicionar_bytes(len(bloco))
+    
+    METRICAS.incrementar("zip.arquivos")
+    METRICAS.incrementar("zip.bytes", info.file_size)
+    if info.compress_type == zipfile.ZIP_STORED:
+        METRICAS.incrementar("zip.sem_compressao")
+    log_item(log, "[+] %s", caminho_relativo, nivel=logging.DEBUG)
+    
+    return info.compress_type
+
+
+# A partir desse tamanho a copia usa copy_file_range (copia feita pelo kernel)
+LIMITE_COPIA_KERNEL = 8 * 1024 * 1024
+
+
+def arquivo_identico(origem, destino, comparar_hash=False):
+    """
+    Verifica se o destino ja e uma copia da origem
+    
+    Args:
+        origem: Arquivo de origem
+        destino: Arquivo de destino
+        comparar_hash: Se True, compara o SHA-256 quando o mtime difere
+    
+    Returns:
+        True se o destino pode ser mantido como esta
+    """
+    if not os.path.exists(destino):
+        return False
+    
+    info_origem = os.stat(origem)
+    info_destino = os.stat(destino)
+    
+    if info_origem.st_size != info_destino.st_size:
+        return False
+    if info_origem.st_mtime_ns == info_destino.st_mtime_ns:
+        return True
+    return comparar_hash and calcular_hash(origem) == calcular_hash(destino)
+
+
+def copiar_arquivo_rapido(origem, destino):
+    """
+    Copia um arquivo preservando metadados (como shutil.copy2)
+    
+    Arquivos grandes sao copiados com os.copy_file_range quando disponivel:
+    os dados nao passam pelo espaco do usuario e sistemas de arquivos como
+    Btrfs/XFS podem fazer reflink. Se o kernel ou o sistema de arquivos nao
+    suportarem, cai para shutil.copy2.
+    
+    Args:
+        origem: Arquivo de origem
+        destino: Arquivo de destino
+    """
+    tamanho = os.path.getsize(origem)
+    
+    if tamanho >= LIMITE_COPIA_KERNEL and hasattr(os, "copy_file_range"):
+        try:
+            with open(origem, 'rb') as f_origem, open(destino, 'wb') as f_destino:
+                restante = tamanho
+                while restante > 0:
+                    copiado = os.copy_file_range(f_origem.fileno(), f_destino.fileno(), restante)
+                    if copiado == 0:
+                        break
+                    restante -= copiado
+            if restante == 0:
+                shutil.copystat(origem, destino)
+                return
+        except OSError:
+            pass
+    
+    shutil.copy2(origem, destino)
+
+
+class RelatorioProgresso:
+    """Mostra o progresso no console no maximo uma vez a cada intervalo"""
+    
+    def __init__(self, descricao, intervalo=2.0):
+        """
+        Args:
+            descricao: Texto exibido antes dos contadores
+            intervalo: Tempo minimo em segundos entre duas linhas
+        """
+        self.descricao = descricao
+        self.intervalo = intervalo
+        self.arquivos = 0
+        self.bytes = 0
+        self.inicio = time.monotonic()
+        self.ultima_exibicao = self.inicio
+    
+    def adicionar_bytes(self, quantidade):
+        self.bytes += quantidade
+        self._talvez_exibir()
+    
+    def adicionar_arquivo(self):
+        self.arquivos += 1
+        self._talvez_exibir()
+    
+    def _talvez_exibir(self):
+        agora = time.monotonic()
+        if agora - self.ultima_exibicao >= self.intervalo:
+            self.ultima_exibicao = agora
+            self.exibir()
+    
+    def exibir(self):
+        decorrido = max(time.monotonic() - self.inicio, 1e-9)
+        mb = self.bytes / (1024 * 1024)
+        log.info("[...] %s: %d arquivos, %.1f MB (%.1f MB/s)",
+                 self.descricao, self.arquivos, mb, mb / decorrido)
+
+
+def calcular_hash(caminho_arquivo, tamanho_bloco=1024 * 1024):
+    """
+    Calcula o hash SHA-256 de um arquivo lendo em blocos
+    
+    Args:
+        caminho_arquivo: Caminho do arquivo
+        tamanho_bloco: Tamanho de cada leitura em bytes
+    
+    Returns:
+        Hash hexadecimal do conteudo
+    """
+    sha = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+# Pasta (dentro do repositorio) onde ficam os chunks dos backups divididos
+PASTA_CHUNKS = "backup_chunks"
+
+# Tabela do gear hash: 256 valores de 64 bits derivados do SHA-256, para que
+# os pontos de corte sejam os mesmos em qualquer maquina e versao do Python
+TABELA_GEAR = [
+    int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], 'big')
+    for i in range(256)
+]
+
+MASCARA_64 = (1 << 64) - 1
+
+
+def encontrar_corte(dados, tamanho_minimo, tamanho_maximo, mascara):
+    """
+    Procura o proximo ponto de corte definido pelo conteudo (gear hash)
+    
+    Args:
+        dados: Bytes a partir do inicio do chunk atual
+        tamanho_minimo: Nenhum corte antes dessa posicao
+        tamanho_maximo: Corte forcado nessa posicao
+        mascara: Bits do hash que precisam ser zero para cortar
+    
+    Returns:
+        Tamanho do chunk
+    """
+    limite = min(len(dados), tamanho_maximo)
+    if limite <= tamanho_minimo:
+        return limite
+    
+    tabela = TABELA_GEAR
+    h = 0
+    for posicao, byte in enumerate(dados[tamanho_minimo:limite], tamanho_minimo + 1):
+        h = ((h << 1) + tabela[byte]) & MASCARA_64
+        if not h & mascara:
+            return posicao
+    return limite
+
+
+def gerar_chunks(caminho_arquivo, tamanho_medio=4 * 1024 * 1024, tamanho_maximo=32 * 1024 * 1024,
+                 inicio=0, tamanho=None):
+    """
+    Divide um arquivo (ou um trecho dele) em chunks definidos pelo conteudo (CDC)
+    
+    Os cortes dependem apenas dos bytes proximos, entao inserir ou remover
+    dados no meio do arquivo so altera os chunks em volta da mudanca e os
+    demais continuam com o mesmo hash.
+    
+    Args:
+        caminho_arquivo: Arquivo que sera dividido
+        tamanho_medio: Tamanho medio desejado (potencia de 2)
+        tamanho_maximo: Nenhum chunk passa desse tamanho
+        inicio: Posicao do primeiro byte do trecho
+        tamanho: Quantidade de bytes do trecho (padrao: ate o fim do arquivo)
+    
+    Yields:
+        Bytes de cada chunk, em ordem
+    """
+    tamanho_minimo = min(tamanho_medio // 4, tamanho_maximo)
+    bits = max(tamanho_medio.bit_length() - 1, 1)
+    # O gear hash desloca para a esquerda: os bits altos dependem de mais bytes
+    mascara = ((1 << bits) - 1) << (64 - bits)
+    
+    with open(caminho_arquivo, 'rb') as f:
+        f.seek(inicio)
+        fim = None if tamanho is None else inicio + tamanho
+        
+        def ler(quantidade):
+            if fim is not None:
+                quantidade = min(quantidade, fim - f.tell())
+            return f.read(quantidade)
+        
+        buffer = ler(tamanho_maximo)
+        while buffer:
+            corte = encontrar_corte(buffer, tamanho_minimo, tamanho_maximo, mascara)
+            yield buffer[:corte]
+            buffer = buffer[corte:] + ler(corte)
+
+
+def blocos_do_zip(caminho_zip, tamanho_minimo, tamanho_maximo):
+    """
+    Divide um ZIP em trechos que seguem os limites dos membros
+    
+    Cada trecho junta membros consecutivos (cabecalho local + dados) e
+    termina antes de um membro cujo nome "marca" um corte (crc32 do nome),
+    depois de somar pelo menos tamanho_minimo, ou ao passar de
+    tamanho_maximo. Como os cortes dependem dos nomes e nao das posicoes,
+    incluir um arquivo so altera o trecho em volta dele. O diretorio
+    central fica sozinho no ultimo trecho.
+    
+    Um arquivo sem alteracao gera os mesmos bytes no ZIP, entao o trecho
+    dele tem o mesmo hash do backup anterior.
+    
+    Args:
+        caminho_zip: Arquivo ZIP
+        tamanho_minimo: Tamanho minimo de cada trecho em bytes
+        tamanho_maximo: Acima disso o trecho e fechado no proximo membro
+    
+    Returns:
+        Lista de tuplas (inicio, tamanho)
+    """
+    with zipfile.ZipFile(caminho_zip, 'r') as zipf:
+        membros = sorted((info.header_offset, info.filename) for info in zipf.infolist())
+        inicio_diretorio = zipf.start_dir
+    tamanho_total = os.path.getsize(caminho_zip)
+    
+    blocos = []
+    inicio = 0
+    for posicao, nome in membros + [(inicio_diretorio, None)]:
+        tamanho = posicao - inicio
+        if not tamanho:
+            continue
+        marca = nome is None or zlib.crc32(nome.encode('utf-8')) % 4 == 0
+        if tamanho >= tamanho_maximo or (tamanho >= tamanho_minimo and marca):
+            blocos.append((inicio, tamanho))
+            inicio = posicao
+    if inicio_diretorio > inicio:
+        blocos.append((inicio, inicio_diretorio - inicio))
+        inicio = inicio_diretorio
+    if tamanho_total > inicio:
+        blocos.append((inicio, tamanho_total - inicio))
+    return blocos
+
+
+# Nomes dos arquivos de backup gravados no repositorio:
+# backup_<ts>.zip, backup_base_<ts>.zip, backup_delta_<ts>.zip e backup_<ts>.indice.json
+# (com sufixo _2, _3... quando mais de um backup do mesmo tipo cai no mesmo segundo)
+PADRAO_BACKUP = re.compile(r"^backup_(?:(base|delta)_)?(\d{8}_\d{6})(?:_(\d+))?(\.zip|\.indice\.json)$")
+
+
+def ordem_backup(encontrado):
+    """Chave de ordenacao (data, tipo, sequencia) de um nome que casou com PADRAO_BACKUP"""
+    tipo, timestamp, sequencia, _ = encontrado.groups()
+    return datetime.strptime(timestamp, "%Y%m%d_%H%M%S"), tipo or "", int(sequencia or 1)
+
+
+class PoliticaRetencao:
+    """Define quais backups continuam no repositorio"""
+    
+    def __init__(self, ultimos=10, diarios_dias=0, semanais_dias=0, pasta_arquivo=None):
+        """
+        Args:
+            ultimos: Quantidade de backups mais recentes sempre mantidos (minimo 1)
+            diarios_dias: Mantem o ultimo backup de cada dia dos ultimos X dias
+            semanais_dias: Mantem o ultimo backup de cada semana dos ultimos X dias
+            pasta_arquivo: Se informada, backups removidos sao movidos para ca
+                           (fora do repositorio) em vez de apagados
+        """
+        self.ultimos = max(ultimos, 1)
+        self.diarios_dias = diarios_dias
+        self.semanais_dias = semanais_dias
+        self.pasta_arquivo = pasta_arquivo
+    
+    def selecionar(self, datas, agora=None):
+        """
+        Escolhe quais backups manter
+        
+        Args:
+            datas: Lista de datetime dos backups
+            agora: Data de referencia (padrao: datetime.now())
+        
+        Returns:
+            Conjunto com as datas que devem ser mantidas
+        """
+        agora = agora or datetime.now()
+        ordenadas = sorted(datas, reverse=True)
+        manter = set(ordenadas[:self.ultimos])
+        
+        dias_vistos = set()
+        semanas_vistas = set()
+        for data in ordenadas:
+            idade = agora - data
+            
+            if idade <= timedelta(days=self.diarios_dias) and data.date() not in dias_vistos:
+                dias_vistos.add(data.date())
+                manter.add(data)
+            
+            semana = data.isocalendar()[:2]
+            if idade <= timedelta(days=self.semanais_dias) and semana not in semanas_vistas:
+                semanas_vistas.add(semana)
+                manter.add(data)
+        
+        return manter
+
+
+class RelatorioExecucao:
+    """Tempo, bytes e quantidade de arquivos de cada etapa de upload_completo"""
+    
+    def __init__(self, repositorio_local, branch):
+        self.repositorio_local = repositorio_local
+        self.branch = branch
+        self.inicio = datetime.now()
+        self.duracao = 0.0
+        self.sucesso = False
+        self.etapas = {}
+    
+    def __bool__(self):
+        # Permite continuar usando 'if uploader.upload_completo(...)'
+        return self.sucesso
+    
+    @contextmanager
+    def medir(self, nome):
+        """
+        Mede o tempo de uma etapa
+        
+        Uso:
+            with relatorio.medir("zip") as etapa:
+                ...
+                etapa["bytes"] = 1234
+        """
+        etapa = {"segundos": 0.0, "bytes": 0, "arquivos": 0}
+        self.etapas[nome] = etapa
+        inicio = time.perf_counter()
+        try:
+            yield etapa
+        finally:
+            etapa["segundos"] = time.perf_counter() - inicio
+            METRICAS.registrar_tempo(f"upload.{nome}", etapa["segundos"])
+    
+    def para_dict(self):
+        """Retorna o relatorio como dicionario serializavel em JSON"""
+        return {
+            "repositorio": self.repositorio_local,
+            "branch": self.branch,
+            "inicio": self.inicio.strftime("%Y-%m-%d %H:%M:%S"),
+            "duracao_segundos": round(self.duracao, 3),
+            "sucesso": self.sucesso,
+            "etapas": {
+                nome: {**etapa, "segundos": round(etapa["segundos"], 3)}
+                for nome, etapa in self.etapas.items()
+            }
+        }
+    
+    def exibir(self):
+        """Mostra a tabela de etapas no console"""
+        print(f"{'ETAPA':<12} {'TEMPO':>9} {'MB':>10} {'ARQUIVOS':>9}")
+        for nome, etapa in self.etapas.items():
+            print(f"{nome:<12} {etapa['segundos']:>8.2f}s "
+                  f"{etapa['bytes'] / (1024 * 1024):>10.2f} {etapa['arquivos']:>9}")
+        print(f"{'total':<12} {self.duracao:>8.2f}s")
+    
+    def enviar_webhook(self, webhook_url, timeout=10):
+        """
+        Envia o relatorio em JSON para um webhook (ex: n8n)
+        
+        Returns:
+            True se o webhook respondeu 200, False caso contrario
+        """
+        import requests  # so e necessario quando o relatorio e enviado
+        
+        try:
+            response = requests.post(webhook_url, json=self.para_dict(), timeout=timeout)
+            
+            if response.status_code == 200:
+                print("[OK] Relatorio enviado para o webhook")
+                return True
+            else:
+                print(f"[ERRO] Falha ao enviar relatorio: {response.status_code}")
+                return False
+        
+        except Exception as e:
+            print(f"[ERRO] {str(e)}")
+            return False
+
 
 class GitHubAutoUpload:
-    def __init__(self, repositorio_local, branch="main"):
+    def __init__(self, repositorio_local, branch="main", retencao=None, trava_push=None):
         """
         Inicializa o uploader automatico para GitHub
         
         Args:
             repositorio_local: Caminho da pasta do repositorio git local
             branch: Nome da branch (padrao: main)
+            retencao: PoliticaRetencao aplicada em upload_completo (opcional)
+            trava_push: Semaforo/lock usado em volta do git push, para limitar
+                        pushes simultaneos entre varios uploaders (opcional)
         """
         self.repositorio_local = repositorio_local
         self.branch = branch
+        self.retencao = retencao
+        self.trava_push = trava_push
         
     def criar_zip(self, pasta_origem, nome_zip=None):
         """
@@ -27,14 +516,13 @@ class GitHubAutoUpload:
         
         Args:
             pasta_origem: Pasta que sera compactada
-            nome_zip: Nome do arquivo ZIP (opcional)
+            nome_zip: Nome do arquivo ZIP ou caminho absoluto (opcional)
         
         Returns:
             Caminho do arquivo ZIP criado
         """
         if nome_zip is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            nome_zip = f"backup_{timestamp}.zip"
+            nome_zip = self._nome_backup("", ".zip")
         
         caminho_zip = os.path.join(self.repositorio_local, nome_zip)
         
@@ -45,21 +533,28 @@ class GitHubAutoUpload:
         print(f"Destino: {caminho_zip}\n")
         
         try:
-            with zipfile.ZipFile(caminho_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            progresso = RelatorioProgresso("Compactando")
+            armazenados = 0
+            
+            with zipfile.ZipFile(caminho_zip, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
                 total_arquivos = 0
                 
                 for raiz, dirs, arquivos in os.walk(pasta_origem):
-                    for arquivo in arquivos:
+                    # Ordem fixa: ZIPs da mesma pasta ficam byte a byte parecidos
+                    dirs.sort()
+                    for arquivo in sorted(arquivos):
                         caminho_arquivo = os.path.join(raiz, arquivo)
                         caminho_relativo = os.path.relpath(caminho_arquivo, pasta_origem)
-                        zipf.write(caminho_arquivo, caminho_relativo)
+                        if escrever_no_zip(zipf, caminho_arquivo, caminho_relativo, progresso) == zipfile.ZIP_STORED:
+                            armazenados += 1
                         total_arquivos += 1
-                        print(f"[+] {caminho_relativo}")
+                        progresso.adicionar_arquivo()
             
             tamanho_mb = os.path.getsize(caminho_zip) / (1024 * 1024)
             
             print(f"\n[OK] ZIP criado com sucesso!")
             print(f"Total de arquivos: {total_arquivos}")
+            print(f"Sem compressao (ja compactados): {armazenados}")
             print(f"Tamanho: {tamanho_mb:.2f} MB")
             print(f"{'='*60}\n")
             
@@ -67,40 +562,665 @@ class GitHubAutoUpload:
         
         except Exception as e:
             print(f"[ERRO] Falha ao criar ZIP: {str(e)}")
+            # Um ZIP pela metade nao pode ser commitado por uma execucao seguinte
+            if os.path.exists(caminho_zip):
+                os.remove(caminho_zip)
             return None
     
-    def adicionar_arquivos_individuais(self, arquivos_lista):
+    def criar_backup_chunks(self, pasta_origem, tamanho_medio=4 * 1024 * 1024, tamanho_maximo=32 * 1024 * 1024):
+        """
+        Cria um backup dividido em chunks deduplicados
+        
+        O ZIP da pasta e gerado fora do repositorio e dividido com
+        gerar_chunks. Cada chunk e gravado em backup_chunks/<hash> apenas se
+        ainda nao existir, e um indice 'backup_<timestamp>.indice.json'
+        descreve como remontar o ZIP. Backups quase iguais compartilham a
+        maior parte dos chunks e nenhum arquivo passa de tamanho_maximo
+        (o GitHub recusa arquivos acima de 100 MB).
+        
+        O ZIP e dividido por trechos de membros (blocos_do_zip). Trechos com
+        o mesmo hash de um trecho do indice anterior reaproveitam a lista de
+        chunks sem passar pelo gear hash, entao so os dados alterados sao
+        divididos de novo.
+        
+        Args:
+            pasta_origem: Pasta que sera compactada
+            tamanho_medio: Tamanho medio dos chunks em bytes (potencia de 2)
+            tamanho_maximo: Tamanho maximo de cada chunk em bytes
+        
+        Returns:
+            Dicionario com 'indice' (caminho do indice), 'novos_chunks'
+            (caminhos dos chunks gravados nesta execucao) e 'total_arquivos'
+            (arquivos dentro do ZIP) ou None se erro
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        nome_indice = self._nome_backup("", ".indice.json", timestamp)
+        nome_zip = nome_indice[:-len(".indice.json")] + ".zip"
+        descritor, caminho_temp = tempfile.mkstemp(suffix=".zip")
+        os.close(descritor)
+        
+        try:
+            if not self.criar_zip(pasta_origem, caminho_temp):
+                return None
+            
+            with zipfile.ZipFile(caminho_temp, 'r') as zipf:
+                total_arquivos = len(zipf.namelist())
+            
+            print(f"{'='*60}")
+            print(f"DIVIDINDO BACKUP EM CHUNKS")
+            print(f"{'='*60}\n")
+            
+            anteriores = self._trechos_do_ultimo_indice(tamanho_medio, tamanho_maximo)
+            
+            progresso = RelatorioProgresso("Dividindo em chunks")
+            sha_total = hashlib.sha256()
+            chunks = []
+            trechos = []
+            novos_chunks = []
+            bytes_novos = 0
+            reaproveitados = 0
+            
+            tamanho_minimo = min(tamanho_medio // 4, tamanho_maximo)
+            for inicio, tamanho in blocos_do_zip(caminho_temp, tamanho_minimo, tamanho_medio):
+                sha_trecho = hashlib.sha256()
+                with open(caminho_temp, 'rb') as f:
+                    f.seek(inicio)
+                    restante = tamanho
+                    while restante:
+                        dados = f.read(min(TAMANHO_BLOCO_ZIP, restante))
+                        sha_trecho.update(dados)
+                        sha_total.update(dados)
+                        restante -= len(dados)
+                hash_trecho = sha_trecho.hexdigest()
+                trechos.append({"sha256": hash_trecho, "inicio": len(chunks)})
+                
+                if hash_trecho in anteriores:
+                    chunks.extend(anteriores[hash_trecho])
+                    reaproveitados += 1
+                else:
+                    for dados in gerar_chunks(caminho_temp, tamanho_medio, tamanho_maximo, inicio, tamanho):
+                        hash_chunk = hashlib.sha256(dados).hexdigest()
+                        chunks.append({"hash": hash_chunk, "tamanho": len(dados)})
+                        
+                        caminho_chunk = self._caminho_chunk(hash_chunk)
+                        if not os.path.exists(caminho_chunk):
+                            os.makedirs(os.path.dirname(caminho_chunk), exist_ok=True)
+                            with open(caminho_chunk + ".tmp", 'wb') as f:
+                                f.write(dados)
+                            os.replace(caminho_chunk + ".tmp", caminho_chunk)
+                            novos_chunks.append(caminho_chunk)
+                            bytes_novos += len(dados)
+                
+                trechos[-1]["quantidade"] = len(chunks) - trechos[-1]["inicio"]
+                progresso.adicionar_bytes(tamanho)
+                progresso.adicionar_arquivo()
+            
+            indice = {
+                "arquivo": nome_zip,
+                "timestamp": timestamp,
+                "tamanho": sum(chunk["tamanho"] for chunk in chunks),
+                "sha256": sha_total.hexdigest(),
+                "tamanho_medio": tamanho_medio,
+                "tamanho_maximo": tamanho_maximo,
+                "chunks": chunks,
+                "trechos": trechos
+            }
+            caminho_indice = os.path.join(self.repositorio_local, nome_indice)
+            with open(caminho_indice + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(indice, f, indent=2)
+            os.replace(caminho_indice + ".tmp", caminho_indice)
+            
+            print(f"[OK] Indice criado: {os.path.basename(caminho_indice)}")
+            print(f"Chunks: {len(chunks)} (novos: {len(novos_chunks)})")
+            print(f"Trechos sem alteracao: {reaproveitados} de {len(trechos)}")
+            print(f"Dados novos no repositorio: {bytes_novos / (1024 * 1024):.2f} MB "
+                  f"de {indice['tamanho'] / (1024 * 1024):.2f} MB")
+            print(f"{'='*60}\n")
+            
+            return {"indice": caminho_indice, "novos_chunks": novos_chunks, "total_arquivos": total_arquivos}
+        
+        except Exception as e:
+            print(f"[ERRO] Falha ao dividir backup em chunks: {str(e)}")
+            return None
+        
+        finally:
+            if os.path.exists(caminho_temp):
+                os.remove(caminho_temp)
+    
+    def _caminho_chunk(self, hash_chunk):
+        return os.path.join(self.repositorio_local, PASTA_CHUNKS, hash_chunk[:2], hash_chunk)
+    
+    def _trechos_do_ultimo_indice(self, tamanho_medio, tamanho_maximo):
+        """
+        Lista de chunks de cada trecho do indice mais recente, por hash do trecho
+        
+        So vale para indices gerados com os mesmos tamanhos de chunk e cujos
+        chunks ainda existem no repositorio.
+        """
+        indices = []
+        for nome in os.listdir(self.repositorio_local):
+            encontrado = PADRAO_BACKUP.match(nome)
+            if encontrado and encontrado.group(4) == ".indice.json":
+                indices.append((ordem_backup(encontrado), nome))
+        if not indices:
+            return {}
+        
+        try:
+            with open(os.path.join(self.repositorio_local, max(indices)[1]), 'r', encoding='utf-8') as f:
+                indice = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if (indice.get("tamanho_medio"), indice.get("tamanho_maximo")) != (tamanho_medio, tamanho_maximo):
+            return {}
+        
+        anteriores = {}
+        for trecho in indice.get("trechos", []):
+            lista = indice["chunks"][trecho["inicio"]:trecho["inicio"] + trecho["quantidade"]]
+            if all(os.path.exists(self._caminho_chunk(chunk["hash"])) for chunk in lista):
+                anteriores[trecho["sha256"]] = lista
+        return anteriores
+    
+    def remontar_backup(self, caminho_indice, caminho_destino=None):
+        """
+        Remonta o ZIP original a partir do indice e dos chunks
+        
+        Args:
+            caminho_indice: Caminho do arquivo .indice.json
+            caminho_destino: Onde gravar o ZIP (padrao: nome original no repositorio)
+        
+        Returns:
+            Caminho do ZIP remontado ou None se erro
+        """
+        try:
+            with open(caminho_indice, 'r', encoding='utf-8') as f:
+                indice = json.load(f)
+            
+            if caminho_destino is None:
+                caminho_destino = os.path.join(self.repositorio_local, indice["arquivo"])
+            
+            sha_total = hashlib.sha256()
+            with open(caminho_destino, 'wb') as destino:
+                for chunk in indice["chunks"]:
+                    with open(self._caminho_chunk(chunk["hash"]), 'rb') as f:
+                        dados = f.read()
+                    sha_total.update(dados)
+                    destino.write(dados)
+            
+            if sha_total.hexdigest() != indice["sha256"]:
+                print(f"[ERRO] Hash do ZIP remontado nao confere: {caminho_destino}")
+                return None
+            
+            print(f"[OK] Backup remontado: {caminho_destino}")
+            return caminho_destino
+        
+        except Exception as e:
+            print(f"[ERRO] Falha ao remontar backup: {str(e)}")
+            return None
+    
+    def carregar_manifesto(self):
+        """
+        Carrega o manifesto de backups incrementais do repositorio
+        
+        Returns:
+            Dicionario com 'arquivos' (estado atual) e 'cadeia' (historico de ZIPs)
+        """
+        caminho_manifesto = os.path.join(self.repositorio_local, NOME_MANIFESTO)
+        
+        if not os.path.exists(caminho_manifesto):
+            return {"arquivos": {}, "cadeia": []}
+        
+        with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def salvar_manifesto(self, manifesto):
+        """Grava o manifesto no repositorio (escrita atomica)"""
+        caminho_manifesto = os.path.join(self.repositorio_local, NOME_MANIFESTO)
+        caminho_temp = caminho_manifesto + ".tmp"
+        
+        with open(caminho_temp, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(caminho_temp, caminho_manifesto)
+        
+        return caminho_manifesto
+    
+    def gerar_manifesto(self, pasta_origem, manifesto_anterior=None, caminhos_alterados=None):
+        """
+        Levanta caminho, tamanho, mtime e hash de cada arquivo da pasta
+        
+        O hash so e recalculado quando tamanho ou mtime mudaram em relacao
+        ao manifesto anterior, entao execucoes sem alteracoes nao releem
+        o conteudo dos arquivos.
+        
+        Args:
+            pasta_origem: Pasta que sera analisada
+            manifesto_anterior: Dicionario 'arquivos' do ultimo backup (opcional)
+            caminhos_alterados: Caminhos relativos que mudaram (opcional). Se
+                                informado, so eles sao relidos e o restante
+                                vem do manifesto anterior, sem varrer a pasta.
+        
+        Returns:
+            Dicionario {caminho_relativo: {"tamanho", "mtime", "hash"}}
+        """
+        manifesto_anterior = manifesto_anterior or {}
+        
+        def entrada(caminho_arquivo, caminho_relativo):
+            info = os.stat(caminho_arquivo)
+            anterior = manifesto_anterior.get(caminho_relativo)
+            if (anterior and anterior["tamanho"] == info.st_size
+                    and anterior["mtime"] == info.st_mtime_ns):
+                hash_arquivo = anterior["hash"]
+            else:
+                hash_arquivo = calcular_hash(caminho_arquivo)
+            return {"tamanho": info.st_size, "mtime": info.st_mtime_ns, "hash": hash_arquivo}
+        
+        def varrer(pasta, destino):
+            for raiz, dirs, arquivos in os.walk(pasta):
+                for arquivo in arquivos:
+                    caminho_arquivo = os.path.join(raiz, arquivo)
+                    caminho_relativo = os.path.relpath(caminho_arquivo, pasta_origem).replace(os.sep, '/')
+                    destino[caminho_relativo] = entrada(caminho_arquivo, caminho_relativo)
+        
+        if caminhos_alterados is None:
+            arquivos_manifesto = {}
+            varrer(pasta_origem, arquivos_manifesto)
+            return arquivos_manifesto
+        
+        arquivos_manifesto = dict(manifesto_anterior)
+        for caminho_relativo in caminhos_alterados:
+            caminho_relativo = caminho_relativo.replace(os.sep, '/').strip('/')
+            caminho_arquivo = os.path.join(pasta_origem, caminho_relativo)
+            
+            if os.path.isfile(caminho_arquivo):
+                arquivos_manifesto[caminho_relativo] = entrada(caminho_arquivo, caminho_relativo)
+                continue
+            
+            # Pasta criada, removida ou movida: refaz tudo que estava embaixo dela
+            arquivos_manifesto.pop(caminho_relativo, None)
+            prefixo = caminho_relativo + '/'
+            for chave in [chave for chave in arquivos_manifesto if chave.startswith(prefixo)]:
+                del arquivos_manifesto[chave]
+            if os.path.isdir(caminho_arquivo):
+                varrer(caminho_arquivo, arquivos_manifesto)
+        
+        return arquivos_manifesto
+    
+    def criar_zip_incremental(self, pasta_origem, nova_base=False, caminhos_alterados=None,
+                              nova_base_a_cada_dias=None, max_deltas=None):
+        """
+        Cria um backup incremental (diferencial) de uma pasta
+        
+        Na primeira execucao (ou com nova_base=True) gera um ZIP completo
+        'backup_base_<timestamp>.zip'. Nas seguintes gera um
+        'backup_delta_<timestamp>.zip' apenas com arquivos novos ou alterados
+        e a lista de arquivos excluidos desde o ultimo backup.
+        
+        Args:
+            pasta_origem: Pasta que sera compactada
+            nova_base: Se True, ignora o manifesto e gera um ZIP base completo
+            caminhos_alterados: Caminhos relativos que mudaram desde o ultimo
+                                backup (opcional, evita varrer a pasta inteira)
+            nova_base_a_cada_dias: Gera uma nova base quando a atual tiver
+                                   pelo menos essa idade (opcional)
+            max_deltas: Gera uma nova base quando a cadeia atual ja tiver
+                        essa quantidade de deltas (opcional)
+        
+        Returns:
+            Caminho do ZIP criado, "" se nao houve alteracoes ou None se erro
+        """
+        print(f"\n{'='*60}")
+        print(f"CRIANDO BACKUP INCREMENTAL")
+        print(f"{'='*60}")
+        print(f"Origem: {pasta_origem}\n")
+        
+        try:
+            manifesto = self.carregar_manifesto()
+            
+            if not nova_base and self._cadeia_vencida(manifesto, nova_base_a_cada_dias, max_deltas):
+                print("[INFO] Cadeia incremental atingiu o limite, gerando nova base")
+                nova_base = True
+            
+            if nova_base or not manifesto["cadeia"]:
+                arquivos_anteriores = {}
+                tipo = "base"
+            else:
+                arquivos_anteriores = manifesto["arquivos"]
+                tipo = "delta"
+            
+            if tipo == "base":
+                caminhos_alterados = None
+            arquivos_atuais = self.gerar_manifesto(pasta_origem, manifesto["arquivos"], caminhos_alterados)
+            
+            alterados = sorted(
+                caminho for caminho, info in arquivos_atuais.items()
+                if arquivos_anteriores.get(caminho, {}).get("hash") != info["hash"]
+            )
+            excluidos = sorted(set(arquivos_anteriores) - set(arquivos_atuais))
+            
+            if tipo == "delta" and not alterados and not excluidos:
+                print("[INFO] Nenhuma alteracao desde o ultimo backup")
+                print(f"{'='*60}\n")
+                return ""
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nome_zip = self._nome_backup(f"{tipo}_", ".zip", timestamp)
+            caminho_zip = os.path.join(self.repositorio_local, nome_zip)
+            
+            progresso = RelatorioProgresso("Compactando")
+            
+            # Grava com nome temporario: um ZIP pela metade nunca fica com nome de backup
+            try:
+                with zipfile.ZipFile(caminho_zip + ".tmp", 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
+                    for caminho_relativo in alterados:
+                        escrever_no_zip(zipf, os.path.join(pasta_origem, caminho_relativo), caminho_relativo,
+                                        progresso)
+                        progresso.adicionar_arquivo()
+                    if excluidos:
+                        zipf.writestr(NOME_EXCLUSOES, json.dumps(excluidos, indent=2))
+                os.replace(caminho_zip + ".tmp", caminho_zip)
+            finally:
+                if os.path.exists(caminho_zip + ".tmp"):
+                    os.remove(caminho_zip + ".tmp")
+            
+            manifesto["arquivos"] = arquivos_atuais
+            manifesto["cadeia"].append({
+                "arquivo": nome_zip,
+                "tipo": tipo,
+                "timestamp": timestamp,
+                "alterados": len(alterados),
+                "excluidos": len(excluidos)
+            })
+            self.salvar_manifesto(manifesto)
+            
+            tamanho_mb = os.path.getsize(caminho_zip) / (1024 * 1024)
+            
+            print(f"[OK] Backup {tipo} criado: {nome_zip}")
+            print(f"Novos/alterados: {len(alterados)}")
+            print(f"Excluidos: {len(excluidos)}")
+            print(f"Tamanho: {tamanho_mb:.2f} MB")
+            print(f"{'='*60}\n")
+            
+            return caminho_zip
+        
+        except Exception as e:
+            print(f"[ERRO] Falha ao criar backup incremental: {str(e)}")
+            return None
+    
+    def _nome_backup(self, prefixo, extensao, timestamp=None):
+        """
+        Nome 'backup_<prefixo><timestamp><extensao>' que ainda nao existe no repositorio
+        
+        Backups do mesmo tipo no mesmo segundo recebem o sufixo _2, _3...
+        """
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        nome = f"backup_{prefixo}{timestamp}{extensao}"
+        sequencia = 1
+        while os.path.exists(os.path.join(self.repositorio_local, nome)):
+            sequencia += 1
+            nome = f"backup_{prefixo}{timestamp}_{sequencia}{extensao}"
+        return nome
+    
+    def _cadeia_vencida(self, manifesto, nova_base_a_cada_dias=None, max_deltas=None):
+        """Indica se a cadeia atual do manifesto passou da idade ou do tamanho maximo"""
+        bases = [i for i, entrada in enumerate(manifesto["cadeia"]) if entrada["tipo"] == "base"]
+        if not bases:
+            return False
+        
+        base = manifesto["cadeia"][bases[-1]]
+        deltas = len(manifesto["cadeia"]) - bases[-1] - 1
+        if max_deltas is not None and deltas >= max_deltas:
+            return True
+        
+        if nova_base_a_cada_dias is not None:
+            idade = datetime.now() - datetime.strptime(base["timestamp"], "%Y%m%d_%H%M%S")
+            if idade >= timedelta(days=nova_base_a_cada_dias):
+                return True
+        return False
+    
+    def restaurar_backup(self, pasta_destino, ate=None):
+        """
+        Reconstroi a pasta a partir do ZIP base e dos deltas seguintes
+        
+        Args:
+            pasta_destino: Pasta onde os arquivos serao restaurados
+            ate: Nome do ZIP limite (restaura ate ele, inclusive) ou timestamp
+                 'YYYYMMDD_HHMMSS' (ultimo estado ate esse momento). Opcional,
+                 padrao: backup mais recente
+        
+        Returns:
+            True se sucesso, False se erro
+        """
+        print(f"\n{'='*60}")
+        print(f"RESTAURANDO BACKUP")
+        print(f"{'='*60}")
+        print(f"Destino: {pasta_destino}\n")
+        
+        try:
+            cadeia = self.carregar_manifesto()["cadeia"]
+            
+            if ate is not None:
+                nomes = [entrada["arquivo"] for entrada in cadeia]
+                if ate in nomes:
+                    cadeia = cadeia[:nomes.index(ate) + 1]
+                elif re.fullmatch(r"\d{8}_\d{6}", ate):
+                    cadeia = [entrada for entrada in cadeia if entrada["timestamp"] <= ate]
+                else:
+                    print(f"[ERRO] Backup '{ate}' nao encontrado no manifesto")
+                    return False
+            
+            # Comeca pelo ZIP base mais recente dentro do limite
+            indices_base = [i for i, entrada in enumerate(cadeia) if entrada["tipo"] == "base"]
+            if not indices_base:
+                print("[ERRO] Nenhum backup base encontrado para o ponto solicitado")
+                return False
+            cadeia = cadeia[indices_base[-1]:]
+            
+            os.makedirs(pasta_destino, exist_ok=True)
+            
+            for entrada in cadeia:
+                caminho_zip = os.path.join(self.repositorio_local, entrada["arquivo"])
+                
+                with zipfile.ZipFile(caminho_zip, 'r') as zipf:
+                    membros = [m for m in zipf.namelist() if m != NOME_EXCLUSOES]
+                    zipf.extractall(pasta_destino, membros)
+                    
+                    if NOME_EXCLUSOES in zipf.namelist():
+                        for caminho_relativo in json.loads(zipf.read(NOME_EXCLUSOES)):
+                            caminho_arquivo = os.path.join(pasta_destino, caminho_relativo)
+                            if os.path.exists(caminho_arquivo):
+                                os.remove(caminho_arquivo)
+                
+                print(f"[+] Aplicado: {entrada['arquivo']}")
+            
+            print(f"\n[OK] Restauracao concluida ({len(cadeia)} arquivo(s) aplicado(s))")
+            print(f"{'='*60}\n")
+            return True
+        
+        except Exception as e:
+            print(f"[ERRO] Falha ao restaurar backup: {str(e)}")
+            return False
+    
+    def aplicar_retencao(self, agora=None):
+        """
+        Remove (ou move) os backups que a politica de retencao nao mantem
+        
+        Cadeias incrementais sao tratadas como um bloco: manter um delta
+        mantem o ZIP base e os deltas anteriores da mesma cadeia. Por isso
+        uma cadeia so sai inteira, depois que uma base mais nova a substitui
+        (ver nova_base_a_cada_dias e max_deltas em upload_completo). Chunks
+        que deixam de ser referenciados por algum indice tambem sao removidos.
+        
+        O historico do git continua com os arquivos antigos; o ganho e na
+        arvore de trabalho (checkout, status e add mais rapidos).
+        
+        Args:
+            agora: Data de referencia (padrao: datetime.now())
+        
+        Returns:
+            Dicionario com 'caminhos' (arquivos removidos e manifesto
+            atualizado, para o staging) e 'bytes_liberados'
+        """
+        resultado = {"caminhos": [], "bytes_liberados": 0}
+        if self.retencao is None:
+            return resultado
+        
+        print(f"\n{'='*60}")
+        print(f"APLICANDO POLITICA DE RETENCAO")
+        print(f"{'='*60}\n")
+        
+        encontrados = []
+        for nome in os.listdir(self.repositorio_local):
+            encontrado = PADRAO_BACKUP.match(nome)
+            if encontrado:
+                encontrados.append((ordem_backup(encontrado), nome, encontrado.group(1)))
+        encontrados.sort(key=lambda item: item[:2])
+        # tipo e None para backups completos e indices de chunks
+        backups = [(ordem[0], tipo, nome) for ordem, nome, tipo in encontrados]
+        
+        manter_datas = self.retencao.selecionar([data for data, _, _ in backups], agora)
+        
+        # So um ZIP base inicia uma cadeia incremental; os outros tipos de
+        # backup no meio dela nao a interrompem
+        manter = set()
+        cadeias = []
+        for data, tipo, nome in backups:
+            if tipo == "base" or (tipo == "delta" and not cadeias):
+                cadeias.append([])
+            if tipo in ("base", "delta"):
+                cadeias[-1].append((data, nome))
+            elif data in manter_datas:
+                manter.add(nome)
+        
+        # Dentro de uma cadeia, manter um ponto exige manter tudo antes dele
+        for cadeia in cadeias:
+            ultimo_mantido = max(
+                (i for i, (data_cadeia, _) in enumerate(cadeia) if data_cadeia in manter_datas),
+                default=-1
+            )
+            manter.update(nome_cadeia for _, nome_cadeia in cadeia[:ultimo_mantido + 1])
+        
+        remover = [os.path.join(self.repositorio_local, nome) for _, _, nome in backups if nome not in manter]
+        
+        # Chunks que so eram usados pelos indices removidos
+        if os.path.isdir(os.path.join(self.repositorio_local, PASTA_CHUNKS)):
+            referenciados = set()
+            for nome in manter:
+                if nome.endswith(".indice.json"):
+                    with open(os.path.join(self.repositorio_local, nome), 'r', encoding='utf-8') as f:
+                        referenciados.update(chunk["hash"] for chunk in json.load(f)["chunks"])
+            for raiz, dirs, arquivos in os.walk(os.path.join(self.repositorio_local, PASTA_CHUNKS)):
+                remover.extend(
+                    os.path.join(raiz, arquivo) for arquivo in arquivos if arquivo not in referenciados
+                )
+        
+        for caminho in remover:
+            try:
+                resultado["bytes_liberados"] += os.path.getsize(caminho)
+                if self.retencao.pasta_arquivo:
+                    caminho_relativo = os.path.relpath(caminho, self.repositorio_local)
+                    destino = os.path.join(self.retencao.pasta_arquivo, caminho_relativo)
+                    os.makedirs(os.path.dirname(destino), exist_ok=True)
+                    shutil.move(caminho, destino)
+                else:
+                    os.remove(caminho)
+                resultado["caminhos"].append(caminho)
+            except Exception as e:
+                print(f"[ERRO] Falha ao remover {caminho}: {str(e)}")
+        
+        # O manifesto incremental nao deve apontar para ZIPs que sairam
+        if os.path.exists(os.path.join(self.repositorio_local, NOME_MANIFESTO)):
+            manifesto = self.carregar_manifesto()
+            cadeia_atual = [e for e in manifesto["cadeia"] if e["arquivo"] in manter]
+            if len(cadeia_atual) != len(manifesto["cadeia"]):
+                manifesto["cadeia"] = cadeia_atual
+                resultado["caminhos"].append(self.salvar_manifesto(manifesto))
+        
+        acao = "Movidos" if self.retencao.pasta_arquivo else "Removidos"
+        print(f"Backups mantidos: {len(manter)} de {len(backups)}")
+        print(f"{acao}: {len(remover)} arquivo(s)")
+        print(f"Espaco liberado: {resultado['bytes_liberados'] / (1024 * 1024):.2f} MB")
+        print(f"{'='*60}\n")
+        
+        return resultado
+    
+    def adicionar_arquivos_individuais(self, arquivos_lista, comparar_hash=False, max_workers=8):
         """
         Copia arquivos individuais para o repositorio
         
+        Arquivos cujo destino ja tem o mesmo tamanho e mtime (ou o mesmo
+        hash, com comparar_hash=True) sao ignorados. Listas longas sao
+        copiadas em paralelo.
+        
         Args:
             arquivos_lista: Lista de caminhos de arquivos para copiar
+            comparar_hash: Se True, compara o conteudo quando o mtime difere
+            max_workers: Numero maximo de copias simultaneas
+        
+        Returns:
+            Dicionario com contadores 'copiados', 'ignorados' e 'falhas' e a
+            lista 'caminhos' com os destinos gravados
         """
         print(f"\n{'='*60}")
         print(f"COPIANDO ARQUIVOS INDIVIDUAIS")
         print(f"{'='*60}\n")
         
+        caminhos_copiados = []
+        
+        def copiar(arquivo):
+            if not os.path.exists(arquivo):
+                log.warning("[AVISO] Arquivo nao encontrado: %s", arquivo)
+                return "falhas"
+            
+            nome_arquivo = os.path.basename(arquivo)
+            destino = os.path.join(self.repositorio_local, nome_arquivo)
+            
+            try:
+                if arquivo_identico(arquivo, destino, comparar_hash):
+                    return "ignorados"
+                copiar_arquivo_rapido(arquivo, destino)
+                log_item(log, "[OK] Copiado: %s", nome_arquivo)
+                caminhos_copiados.append(destino)
+                return "copiados"
+            except Exception as e:
+                log.error("[ERRO] Falha ao copiar %s: %s", nome_arquivo, str(e))
+                return "falhas"
+        
+        # Origens com o mesmo nome iriam para o mesmo destino: vale a ultima
+        # da lista (como na copia sequencial) e as copias nao concorrem
+        por_destino = {}
         for arquivo in arquivos_lista:
-            if os.path.exists(arquivo):
-                nome_arquivo = os.path.basename(arquivo)
-                destino = os.path.join(self.repositorio_local, nome_arquivo)
-                
-                try:
-                    shutil.copy2(arquivo, destino)
-                    print(f"[OK] Copiado: {nome_arquivo}")
-                except Exception as e:
-                    print(f"[ERRO] Falha ao copiar {nome_arquivo}: {str(e)}")
-            else:
-                print(f"[AVISO] Arquivo nao encontrado: {arquivo}")
+            nome_arquivo = os.path.basename(arquivo)
+            if nome_arquivo in por_destino:
+                log.warning("[AVISO] %s e %s tem o mesmo nome; sera copiado apenas %s",
+                            por_destino[nome_arquivo], arquivo, arquivo)
+                del por_destino[nome_arquivo]
+            por_destino[nome_arquivo] = arquivo
+        arquivos_unicos = list(por_destino.values())
+        
+        if len(arquivos_unicos) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(arquivos_unicos))) as executor:
+                resultados = list(executor.map(copiar, arquivos_unicos))
+        else:
+            resultados = [copiar(arquivo) for arquivo in arquivos_unicos]
+        
+        resumo = {chave: resultados.count(chave) for chave in ("copiados", "ignorados", "falhas")}
+        for chave in ("copiados", "ignorados", "falhas"):
+            METRICAS.incrementar(f"copia.{chave}", resumo[chave])
+        resumo["caminhos"] = caminhos_copiados
         
-        print(f"\n{'='*60}\n")
+        print(f"\nCopiados: {resumo['copiados']} | Sem alteracao: {resumo['ignorados']} | "
+              f"Falhas: {resumo['falhas']}")
+        print(f"{'='*60}\n")
+        
+        return resumo
     
-    def executar_comando_git(self, comando):
+    def executar_comando_git(self, comando, entrada=None):
         """
         Executa um comando git e retorna o resultado
         
         Args:
             comando: Lista com o comando git (ex: ['git', 'status'])
+            entrada: Texto enviado para o stdin do comando (opcional)
         
         Returns:
             Tupla (sucesso, output)
@@ -109,13 +1229,15 @@ class GitHubAutoUpload:
             resultado = subprocess.run(
                 comando,
                 cwd=self.repositorio_local,
+                input=entrada,
                 capture_output=True,
                 text=True,
                 check=True
             )
             return True, resultado.stdout
         except subprocess.CalledProcessError as e:
-            return False, e.stderr
+            # "nothing to commit" e outras mensagens do git vao para o stdout
+            return False, (e.stderr or "") + (e.stdout or "")
     
     def verificar_repositorio(self):
         """Verifica se o diretorio e um repositorio git valido"""
@@ -137,6 +1259,170 @@ class GitHubAutoUpload:
             print(f"[ERRO] Falha ao adicionar arquivos: {output}")
             return False
     
+    def _caminhos_relativos(self, caminhos):
+        """Converte caminhos gravados no repositorio para caminhos relativos a raiz"""
+        return [
+            os.path.relpath(caminho, self.repositorio_local).replace(os.sep, '/')
+            for caminho in caminhos
+        ]
+    
+    def caminhos_pendentes(self, destinos=()):
+        """
+        Lista arquivos gravados pelo uploader que ainda nao foram commitados
+        
+        Sobram de execucoes anteriores que falharam depois de gravar (ex: erro
+        no git add ou no commit). Sem eles o manifesto commitado apontaria
+        para deltas que nao estao no repositorio, e arquivos individuais sem
+        alteracao nunca seriam commitados. ZIPs base/delta fora da cadeia do
+        manifesto e chunks sem indice sao ignorados (sobras de falhas).
+        
+        Args:
+            destinos: Caminhos dos arquivos individuais no repositorio
+        
+        Returns:
+            Lista de caminhos absolutos (novos, modificados ou apagados)
+        """
+        sucesso, output = self.executar_comando_git(
+            ['git', 'ls-files', '-z', '--others', '--modified', '--deleted', '--exclude-standard', '--',
+             'backup_*.zip', 'backup_*.indice.json', NOME_MANIFESTO, f'{PASTA_CHUNKS}/']
+            + [f':(literal){caminho}' for caminho in self._caminhos_relativos(destinos)]
+        )
+        if not sucesso:
+            return []
+        
+        cadeia = {entrada["arquivo"] for entrada in self.carregar_manifesto()["cadeia"]}
+        chunks_referenciados = None
+        pendentes = []
+        
+        for caminho in sorted({caminho for caminho in output.split('\0') if caminho}):
+            absoluto = os.path.join(self.repositorio_local, caminho)
+            encontrado = PADRAO_BACKUP.match(caminho)
+            
+            if os.path.exists(absoluto):
+                if encontrado and encontrado.group(1) and caminho not in cadeia:
+                    print(f"[AVISO] Ignorando {caminho}: fora da cadeia do manifesto")
+                    continue
+                if caminho.startswith(f'{PASTA_CHUNKS}/'):
+                    if chunks_referenciados is None:
+                        chunks_referenciados = self._chunks_referenciados()
+                    if os.path.basename(caminho) not in chunks_referenciados:
+                        continue
+            pendentes.append(absoluto)
+        
+        return pendentes
+    
+    def _chunks_referenciados(self):
+        """Hashes de todos os chunks usados pelos indices do repositorio"""
+        referenciados = set()
+        for nome in os.listdir(self.repositorio_local):
+            encontrado = PADRAO_BACKUP.match(nome)
+            if encontrado and encontrado.group(4) == ".indice.json":
+                with open(os.path.join(self.repositorio_local, nome), 'r', encoding='utf-8') as f:
+                    referenciados.update(chunk["hash"] for chunk in json.load(f)["chunks"])
+        return referenciados
+    
+    def git_add_caminhos(self, caminhos):
+        """
+        Adiciona ao staging apenas os caminhos informados
+        
+        Os caminhos sao enviados pelo stdin com --pathspec-from-file, entao o
+        git nao precisa varrer a arvore de trabalho inteira como em 'git add .'
+        Sao tratados como nomes literais (um 'a[1].py' nao casa com 'a1.py').
+        Caminhos no .gitignore sao pulados com aviso, como no 'git add .'
+        
+        Args:
+            caminhos: Lista de caminhos (absolutos ou relativos ao repositorio)
+        """
+        print(f"[GIT] Adicionando {len(caminhos)} caminho(s) ao staging...")
+        existentes = [caminho for caminho in caminhos if os.path.exists(caminho)]
+        removidos = [caminho for caminho in caminhos if not os.path.exists(caminho)]
+        sucesso, output = True, ""
+        
+        if existentes:
+            sucesso, output = self.executar_comando_git(
+                ['git', '--literal-pathspecs', 'add', '--pathspec-from-file=-', '--pathspec-file-nul'],
+                entrada='\0'.join(self._caminhos_relativos(existentes))
+            )
+            # O git adiciona os demais caminhos e so entao falha pelos ignorados
+            if not sucesso and "ignored by one of your .gitignore files" in output:
+                print(f"[AVISO] Caminhos ignorados pelo .gitignore nao foram adicionados:\n{output.strip()}")
+                sucesso = True
+        
+        # Caminhos apagados (ex: retencao) que nunca foram commitados sao ignorados
+        if sucesso and removidos:
+            sucesso, output = self.executar_comando_git(
+                ['git', '--literal-pathspecs', 'rm', '--cached', '-q', '--ignore-unmatch',
+                 '--pathspec-from-file=-', '--pathspec-file-nul'],
+                entrada='\0'.join(self._caminhos_relativos(removidos))
+            )
+        
+        if sucesso:
+            print("[OK] Arquivos adicionados ao staging")
+            return True
+        else:
+            print(f"[ERRO] Falha ao adicionar arquivos: {output}")
+            return False
+    
+    def git_commit_direto(self, caminhos, mensagem=None):
+        """
+        Cria o commit com comandos de baixo nivel do git (plumbing)
+        
+        Atualiza o indice so para os caminhos informados (update-index),
+        gera a arvore (write-tree), o commit (commit-tree) e move a branch
+        atual (update-ref). Nenhum passo percorre a arvore de trabalho, entao
+        o custo nao cresce com o tamanho do repositorio. Indicado para
+        backups que gravam apenas ZIPs.
+        
+        Args:
+            caminhos: Lista de caminhos gravados (absolutos ou relativos ao repositorio)
+            mensagem: Mensagem do commit (opcional)
+        """
+        if mensagem is None:
+            mensagem = f"Backup automatico - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        
+        print(f"[GIT] Fazendo commit direto: {mensagem}")
+        
+        sucesso, output = self.executar_comando_git(
+            ['git', 'update-index', '--add', '--remove', '-z', '--stdin'],
+            entrada='\0'.join(self._caminhos_relativos(caminhos)) + '\0'
+        )
+        if not sucesso:
+            print(f"[ERRO] Falha ao atualizar o indice: {output}")
+            return False
+        
+        sucesso, arvore = self.executar_comando_git(['git', 'write-tree'])
+        if not sucesso:
+            print(f"[ERRO] Falha ao gerar a arvore: {arvore}")
+            return False
+        arvore = arvore.strip()
+        
+        # Commit e arvore atuais em uma chamada; falha em repositorio sem commits
+        tem_pai, saida = self.executar_comando_git(['git', 'rev-parse', 'HEAD', 'HEAD^{tree}'])
+        
+        comando_commit = ['git', 'commit-tree', arvore, '-m', mensagem]
+        if tem_pai:
+            pai, arvore_pai = saida.split()
+            if arvore_pai == arvore:
+                print("[INFO] Nenhuma alteracao para commitar")
+                return True
+            comando_commit += ['-p', pai]
+        
+        sucesso, commit = self.executar_comando_git(comando_commit)
+        if not sucesso:
+            print(f"[ERRO] Falha ao fazer commit: {commit}")
+            return False
+        
+        comando_ref = ['git', 'update-ref', '-m', f"commit: {mensagem}", 'HEAD', commit.strip()]
+        if tem_pai:
+            comando_ref.append(pai)
+        sucesso, output = self.executar_comando_git(comando_ref)
+        if not sucesso:
+            print(f"[ERRO] Falha ao atualizar a branch: {output}")
+            return False
+        
+        print("[OK] Commit realizado com sucesso")
+        return True
+    
     def git_commit(self, mensagem=None):
         """Faz commit das alteracoes"""
         if mensagem is None:
@@ -158,7 +1444,8 @@ class GitHubAutoUpload:
     def git_push(self):
         """Envia alteracoes para o GitHub"""
         print(f"[GIT] Enviando para GitHub (branch: {self.branch})...")
-        sucesso, output = self.executar_comando_git(['git', 'push', 'origin', self.branch])
+        with self.trava_push or nullcontext():
+            sucesso, output = self.executar_comando_git(['git', 'push', 'origin', self.branch])
         
         if sucesso:
             print("[OK] Alteracoes enviadas para GitHub com sucesso!")
@@ -171,60 +1458,210 @@ class GitHubAutoUpload:
             print("3. Voce tem permissao de push")
             return False
     
-    def upload_completo(self, pasta_origem=None, arquivos=None, mensagem_commit=None, criar_zip_backup=True):
+    def upload_completo(self, pasta_origem=None, arquivos=None, mensagem_commit=None, criar_zip_backup=True,
+                        incremental=False, adicionar_tudo=False, commit_direto=False, dividir_chunks=False,
+                        webhook_relatorio=None, caminhos_alterados=None,
+                        tamanho_medio_chunk=4 * 1024 * 1024, tamanho_maximo_chunk=32 * 1024 * 1024,
+                        nova_base=False, nova_base_a_cada_dias=None, max_deltas=None):
         """
         Executa todo o processo de upload para GitHub
         
+        A criacao do ZIP e a copia dos arquivos individuais rodam ao mesmo
+        tempo. Por padrao so os caminhos gravados nesta execucao (ZIP,
+        manifesto, arquivos copiados e backups removidos pela retencao) vao
+        para o staging.
+        
         Args:
             pasta_origem: Pasta para compactar em ZIP (opcional)
             arquivos: Lista de arquivos individuais (opcional)
             mensagem_commit: Mensagem do commit (opcional)
             criar_zip_backup: Se True, cria ZIP da pasta_origem
+            incremental: Se True, gera apenas o delta desde o ultimo backup
+            adicionar_tudo: Se True, usa 'git add .' como antes (inclui
+                            alteracoes feitas fora do uploader)
+            commit_direto: Se True, cria o commit via plumbing (git_commit_direto)
+            dividir_chunks: Se True, grava o ZIP como chunks deduplicados + indice
+            webhook_relatorio: URL que recebe o relatorio da execucao em JSON (opcional)
+            caminhos_alterados: Caminhos relativos a pasta_origem que mudaram
+                                (opcional, usado com incremental=True)
+            tamanho_medio_chunk: Tamanho medio dos chunks em bytes (dividir_chunks=True)
+            tamanho_maximo_chunk: Tamanho maximo de cada chunk em bytes (dividir_chunks=True)
+            nova_base: Se True, inicia uma nova cadeia incremental (incremental=True)
+            nova_base_a_cada_dias: Inicia uma nova cadeia quando a base atual
+                                   tiver essa idade (incremental=True). Com
+                                   retencao, cadeias antigas so saem assim.
+            max_deltas: Inicia uma nova cadeia apos essa quantidade de deltas
+                        (incremental=True)
         
         Returns:
-            True se sucesso, False se erro
+            RelatorioExecucao com tempo, bytes e arquivos de cada etapa.
+            Avaliado como booleano, e True se sucesso e False se erro.
         """
         print(f"\n{'#'*60}")
         print(f"# UPLOAD AUTOMATICO PARA GITHUB")
         print(f"{'#'*60}\n")
         
+        relatorio = RelatorioExecucao(self.repositorio_local, self.branch)
+        inicio = time.perf_counter()
+        
+        relatorio.sucesso = self._executar_upload(
+            relatorio, pasta_origem, arquivos, mensagem_commit, criar_zip_backup,
+            incremental, adicionar_tudo, commit_direto, dividir_chunks, caminhos_alterados,
+            (tamanho_medio_chunk, tamanho_maximo_chunk),
+            {"nova_base": nova_base, "nova_base_a_cada_dias": nova_base_a_cada_dias, "max_deltas": max_deltas}
+        )
+        relatorio.duracao = time.perf_counter() - inicio
+        
+        print()
+        relatorio.exibir()
+        
+        if webhook_relatorio:
+            relatorio.enviar_webhook(webhook_relatorio)
+        
+        if relatorio.sucesso:
+            print(f"\n{'#'*60}")
+            print(f"# PROCESSO CONCLUIDO COM SUCESSO!")
+            print(f"{'#'*60}\n")
+        
+        return relatorio
+    
+    def _etapa_backup(self, relatorio, pasta_origem, incremental, dividir_chunks, caminhos_alterados=None,
+                      tamanhos_chunk=(), opcoes_incremental=None):
+        """Cria o ZIP (completo, incremental ou em chunks) e retorna os caminhos gravados"""
+        with relatorio.medir("zip") as etapa:
+            caminhos = []
+            
+            if incremental:
+                zip_criado = self.criar_zip_incremental(
+                    pasta_origem, caminhos_alterados=caminhos_alterados, **(opcoes_incremental or {})
+                )
+                if zip_criado:
+                    caminhos = [zip_criado, os.path.join(self.repositorio_local, NOME_MANIFESTO)]
+            elif dividir_chunks:
+                backup_chunks = self.criar_backup_chunks(pasta_origem, *tamanhos_chunk)
+                zip_criado = backup_chunks and backup_chunks["indice"]
+                if zip_criado:
+                    caminhos = [zip_criado] + backup_chunks["novos_chunks"]
+                    etapa["arquivos"] = backup_chunks["total_arquivos"]
+            else:
+                zip_criado = self.criar_zip(pasta_origem)
+                if zip_criado:
+                    caminhos = [zip_criado]
+            
+            if zip_criado is None:
+                return None
+            
+            if zip_criado.endswith(".zip"):
+                with zipfile.ZipFile(zip_criado, 'r') as zipf:
+                    etapa["arquivos"] = len(zipf.namelist())
+            etapa["bytes"] = sum(os.path.getsize(caminho) for caminho in caminhos)
+            
+            return caminhos
+    
+    def _etapa_copia(self, relatorio, arquivos):
+        """Copia os arquivos individuais e retorna os caminhos gravados"""
+        with relatorio.medir("copia") as etapa:
+            resumo = self.adicionar_arquivos_individuais(arquivos)
+            etapa["arquivos"] = resumo["copiados"]
+            etapa["bytes"] = sum(os.path.getsize(caminho) for caminho in resumo["caminhos"])
+            return resumo["caminhos"]
+    
+    def _executar_upload(self, relatorio, pasta_origem, arquivos, mensagem_commit, criar_zip_backup,
+                         incremental, adicionar_tudo, commit_direto, dividir_chunks, caminhos_alterados=None,
+                         tamanhos_chunk=(), opcoes_incremental=None):
+        """Etapas de upload_completo; retorna True se sucesso, False se erro"""
+        caminhos_gravados = []
+        
         # Verificar repositorio
         if not self.verificar_repositorio():
             return False
         
-        # Criar ZIP se solicitado
-        if criar_zip_backup and pasta_origem:
-            zip_criado = self.criar_zip(pasta_origem)
-            if not zip_criado:
-                print("[ERRO] Falha ao criar ZIP. Abortando...")
-                return False
+        # Criar ZIP e copiar arquivos individuais em paralelo (sao independentes)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futuro_zip = None
+            futuro_copia = None
+            
+            if criar_zip_backup and pasta_origem:
+                futuro_zip = executor.submit(
+                    self._etapa_backup, relatorio, pasta_origem, incremental, dividir_chunks,
+                    caminhos_alterados, tamanhos_chunk, opcoes_incremental
+                )
+            if arquivos:
+                futuro_copia = executor.submit(self._etapa_copia, relatorio, arquivos)
+            
+            if futuro_copia:
+                caminhos_gravados.extend(futuro_copia.result())
+            if futuro_zip:
+                caminhos_zip = futuro_zip.result()
+                if caminhos_zip is None:
+                    print("[ERRO] Falha ao criar ZIP. Abortando...")
+                    return False
+                caminhos_gravados.extend(caminhos_zip)
         
-        # Copiar arquivos individuais
-        if arquivos:
-            self.adicionar_arquivos_individuais(arquivos)
+        # Aplicar politica de retencao (depende do ZIP novo ja existir)
+        if self.retencao is not None:
+            with relatorio.medir("retencao") as etapa:
+                resultado = self.aplicar_retencao()
+                caminhos_gravados.extend(resultado["caminhos"])
+                etapa["arquivos"] = len(resultado["caminhos"])
+                etapa["bytes"] = resultado["bytes_liberados"]
         
         # Processo Git
         print(f"{'='*60}")
         print("INICIANDO PROCESSO GIT")
         print(f"{'='*60}\n")
         
-        # 1. Git Add
-        if not self.git_add_all():
-            return False
+        if not adicionar_tudo:
+            # Recupera o que execucoes que falharam antes do commit deixaram gravado
+            gravados = {os.path.abspath(caminho) for caminho in caminhos_gravados}
+            destinos = [
+                os.path.join(self.repositorio_local, os.path.basename(arquivo)) for arquivo in arquivos or []
+            ]
+            pendentes = [
+                caminho for caminho in self.caminhos_pendentes(destinos)
+                if os.path.abspath(caminho) not in gravados
+            ]
+            if pendentes:
+                print(f"[INFO] {len(pendentes)} arquivo(s) de execucoes anteriores ainda nao commitado(s)")
+                caminhos_gravados.extend(pendentes)
         
-        # 2. Git Commit
-        if not self.git_commit(mensagem_commit):
-            return False
+        bytes_gravados = sum(
+            os.path.getsize(caminho) for caminho in caminhos_gravados if os.path.exists(caminho)
+        )
         
-        # 3. Git Push
-        if not self.git_push():
-            return False
+        if adicionar_tudo or caminhos_gravados:
+            if commit_direto and not adicionar_tudo:
+                # 1+2. Indice e commit sem varrer a arvore de trabalho
+                with relatorio.medir("git_commit") as etapa:
+                    etapa["arquivos"] = len(caminhos_gravados)
+                    etapa["bytes"] = bytes_gravados
+                    if not self.git_commit_direto(caminhos_gravados, mensagem_commit):
+                        return False
+            else:
+                # 1. Git Add
+                with relatorio.medir("git_add") as etapa:
+                    if adicionar_tudo:
+                        sucesso = self.git_add_all()
+                    else:
+                        etapa["arquivos"] = len(caminhos_gravados)
+                        etapa["bytes"] = bytes_gravados
+                        sucesso = self.git_add_caminhos(caminhos_gravados)
+                if not sucesso:
+                    return False
+                
+                # 2. Git Commit
+                with relatorio.medir("git_commit"):
+                    sucesso = self.git_commit(mensagem_commit)
+                if not sucesso:
+                    return False
+        else:
+            print("[INFO] Nenhum arquivo gravado nesta execucao, nada para commitar")
         
-        print(f"\n{'#'*60}")
-        print(f"# PROCESSO CONCLUIDO COM SUCESSO!")
-        print(f"{'#'*60}\n")
+        # 3. Git Push
+        with relatorio.medir("git_push"):
+            sucesso = self.git_push()
         
-        return True
+        return sucesso
 
 
 # ===================================================================
@@ -352,6 +1789,32 @@ def modo_interativo():
     )
 
 
+# ===================================================================
+# EXEMPLO 5: Backup incremental e restauracao
+# ===================================================================
+def exemplo_backup_incremental():
+    """Exemplo de backup incremental (base + deltas) e restauracao"""
+    
+    # Mantem os 10 ultimos, um por dia na ultima semana e um por semana em 2 meses
+    uploader = GitHubAutoUpload(
+        repositorio_local="C:/Users/Usuario/automacoes-n8n-python",
+        retencao=PoliticaRetencao(ultimos=10, diarios_dias=7, semanais_dias=60)
+    )
+    
+    # Primeira execucao gera o ZIP base; as seguintes geram apenas deltas.
+    # Uma nova base por semana deixa as cadeias antigas livres para a retencao.
+    uploader.upload_completo(
+        pasta_origem="C:/Projetos/MeuProjeto",
+        mensagem_commit=f"Backup incremental - {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+        criar_zip_backup=True,
+        incremental=True,
+        nova_base_a_cada_dias=7
+    )
+    
+    # Reconstroi a pasta como estava no backup mais recente
+    uploader.restaurar_backup("C:/Restauracao/MeuProjeto")
+
+
 # ===================================================================
 # EXECUCAO PRINCIPAL
 # ===================================================================
@@ -361,8 +1824,9 @@ if __name__ == "__main__":
     print("2 - Exemplo com ZIP")
     print("3 - Exemplo completo")
     print("4 - Modo interativo")
+    print("5 - Backup incremental")
     
-    escolha = input("\nOpcao (1/2/3/4): ").strip()
+    escolha = input("\nOpcao (1/2/3/4/5): ").strip()
     
     if escolha == "1":
         exemplo_upload_simples()
@@ -372,6 +1836,8 @@ if __name__ == "__main__":
         exemplo_completo()
     elif escolha == "4":
         modo_interativo()
+    elif escolha == "5":
+        exemplo_backup_incremental()
     else:
         print("[ERRO] Opcao invalida!")
 
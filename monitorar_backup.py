@@ -0,0 +1,327 @@
+# ===================================================================
+# monitorar_backup.py
+# Observa pastas/arquivos e envia backups incrementais para o GitHub
+# assim que houver alteracoes (substitui o cron de 15 em 15 minutos)
+# ===================================================================
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+from github_auto_upload import GitHubAutoUpload
+
+# Constantes do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+MASCARA_EVENTOS = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                   | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+# Cabecalho de cada evento: wd, mask, cookie, len
+FORMATO_EVENTO = "iIII"
+TAMANHO_EVENTO = struct.calcsize(FORMATO_EVENTO)
+
+
+class Inotify:
+    """Acesso minimo ao inotify do Linux via ctypes (sem dependencias externas)"""
+    
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            erro = ctypes.get_errno()
+            raise OSError(erro, os.strerror(erro))
+    
+    def adicionar(self, caminho):
+        """Adiciona uma pasta; retorna o descritor do watch"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(caminho), MASCARA_EVENTOS)
+        if wd < 0:
+            erro = ctypes.get_errno()
+            raise OSError(erro, os.strerror(erro), caminho)
+        return wd
+    
+    def ler(self, timeout):
+        """
+        Aguarda eventos por ate 'timeout' segundos
+        
+        Returns:
+            Lista de tuplas (wd, mascara, nome)
+        """
+        prontos, _, _ = select.select([self.fd], [], [], timeout)
+        if not prontos:
+            return []
+        
+        try:
+            dados = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        
+        eventos = []
+        posicao = 0
+        while posicao + TAMANHO_EVENTO <= len(dados):
+            wd, mascara, _, tamanho = struct.unpack_from(FORMATO_EVENTO, dados, posicao)
+            posicao += TAMANHO_EVENTO
+            nome = os.fsdecode(dados[posicao:posicao + tamanho].rstrip(b"\0"))
+            posicao += tamanho
+            eventos.append((wd, mascara, nome))
+        return eventos
+    
+    def fechar(self):
+        os.close(self.fd)
+
+
+class MonitorBackup:
+    """Dispara upload_completo incremental quando pasta_origem ou arquivos mudam"""
+    
+    # Opcoes que o monitor define a cada envio
+    OPCOES_DO_MONITOR = ("pasta_origem", "arquivos", "criar_zip_backup", "incremental", "caminhos_alterados")
+    
+    def __init__(self, uploader, pasta_origem=None, arquivos=None, janela=30,
+                 espera_maxima=300, limite_pendentes=10000, intervalo_polling=900, opcoes_upload=None):
+        """
+        Args:
+            uploader: Instancia de GitHubAutoUpload
+            pasta_origem: Pasta observada (backup incremental)
+            arquivos: Lista de arquivos individuais observados
+            janela: Segundos sem novos eventos antes de disparar o upload
+            espera_maxima: Dispara mesmo com eventos continuos apos esse tempo
+            limite_pendentes: Acima disso as alteracoes viram uma varredura completa
+            intervalo_polling: Intervalo usado quando o inotify nao esta disponivel
+            opcoes_upload: Demais argumentos de upload_completo (ex: nova_base_a_cada_dias,
+                           max_deltas, commit_direto, mensagem_commit). Sem uma nova base
+                           de tempos em tempos a cadeia de deltas cresce sem limite e a
+                           retencao nao consegue remove-la.
+        """
+        opcoes_upload = dict(opcoes_upload or {})
+        conflitantes = sorted(set(opcoes_upload) & set(self.OPCOES_DO_MONITOR))
+        if conflitantes:
+            raise ValueError(f"Opcoes definidas pelo monitor: {', '.join(conflitantes)}")
+        self.uploader = uploader
+        self.pasta_origem = os.path.abspath(pasta_origem) if pasta_origem else None
+        self.arquivos = {os.path.abspath(arquivo) for arquivo in (arquivos or [])}
+        self.janela = janela
+        self.espera_maxima = espera_maxima
+        self.limite_pendentes = limite_pendentes
+        self.intervalo_polling = intervalo_polling
+        self.opcoes_upload = opcoes_upload
+        
+        self.inotify = None
+        self.pastas_por_wd = {}
+        self.watches_incompletos = False
+        self._limpar_pendentes()
+    
+    def _limpar_pendentes(self):
+        self.pendentes = set()
+        self.arquivos_pendentes = set()
+        # Sem watch em todas as subpastas, qualquer evento exige varredura completa
+        self.varredura_completa = self.watches_incompletos
+        self.primeiro_evento = None
+        self.ultimo_evento = None
+    
+    def _observar_arvore(self, pasta):
+        """Adiciona watches para a pasta e todas as subpastas"""
+        for raiz, dirs, _ in os.walk(pasta):
+            try:
+                self.pastas_por_wd[self.inotify.adicionar(raiz)] = raiz
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    print("[AVISO] Limite de watches do inotify atingido "
+                          "(fs.inotify.max_user_watches); usando varredura completa")
+                    self.watches_incompletos = True
+                    self.varredura_completa = True
+                    return
+                # Pasta removida entre o walk e o add_watch
+    
+    def _registrar(self, caminho):
+        """Anota um caminho alterado, respeitando o limite de memoria"""
+        agora = time.monotonic()
+        self.primeiro_evento = self.primeiro_evento or agora
+        self.ultimo_evento = agora
+        
+        if caminho in self.arquivos:
+            self.arquivos_pendentes.add(caminho)
+        
+        if self.varredura_completa or not self._dentro_da_origem(caminho):
+            return
+        
+        self.pendentes.add(os.path.relpath(caminho, self.pasta_origem))
+        if len(self.pendentes) > self.limite_pendentes:
+            # Muitas alteracoes: o manifesto resolve com uma varredura normal
+            self.pendentes = set()
+            self.varredura_completa = True
+    
+    def _processar_eventos(self, eventos):
+        for wd, mascara, nome in eventos:
+            if mascara & IN_Q_OVERFLOW:
+                print("[AVISO] Fila do inotify estourou; proximo backup fara varredura completa")
+                self.varredura_completa = True
+                self.primeiro_evento = self.primeiro_evento or time.monotonic()
+                self.ultimo_evento = time.monotonic()
+                # Pastas criadas durante o estouro ficaram sem watch
+                # (pastas ja observadas mantem o mesmo wd)
+                if self.pasta_origem:
+                    self._observar_arvore(self.pasta_origem)
+                continue
+            
+            if mascara & IN_IGNORED:
+                self.pastas_por_wd.pop(wd, None)
+                continue
+            
+            pasta = self.pastas_por_wd.get(wd)
+            if pasta is None:
+                continue
+            
+            caminho = os.path.join(pasta, nome) if nome else pasta
+            
+            # Pasta nova (ou movida para dentro): observa e inclui todo o conteudo
+            if mascara & IN_ISDIR and mascara & (IN_CREATE | IN_MOVED_TO) and self._dentro_da_origem(caminho):
+                self._observar_arvore(caminho)
+            
+            self._registrar(caminho)
+    
+    def _dentro_da_origem(self, caminho):
+        return bool(self.pasta_origem) and (
+            caminho == self.pasta_origem or caminho.startswith(self.pasta_origem + os.sep)
+        )
+    
+    def _pronto_para_enviar(self):
+        if self.ultimo_evento is None:
+            return False
+        agora = time.monotonic()
+        return (agora - self.ultimo_evento >= self.janela
+                or agora - self.primeiro_evento >= self.espera_maxima)
+    
+    def _enviar(self):
+        """
+        Executa o upload incremental com o que foi acumulado
+        
+        Se o upload falhar, o proximo envio (apos uma nova janela) faz uma
+        varredura completa e repete os arquivos individuais, para que as
+        alteracoes desta rodada nao se percam.
+        """
+        houve_pasta = self.varredura_completa or bool(self.pendentes)
+        caminhos_alterados = None if self.varredura_completa else sorted(self.pendentes)
+        arquivos = sorted(self.arquivos_pendentes)
+        self._limpar_pendentes()
+        
+        if not houve_pasta and not arquivos:
+            return
+        
+        if caminhos_alterados is None and houve_pasta:
+            descricao_pasta = "varredura completa da pasta"
+        else:
+            descricao_pasta = f"{len(caminhos_alterados)} caminho(s) alterado(s) na pasta"
+        print(f"\n[MONITOR] {descricao_pasta}, {len(arquivos)} arquivo(s) individual(is)")
+        
+        try:
+            sucesso = bool(self.uploader.upload_completo(
+                pasta_origem=self.pasta_origem if houve_pasta else None,
+                arquivos=arquivos,
+                criar_zip_backup=houve_pasta,
+                incremental=True,
+                caminhos_alterados=caminhos_alterados,
+                **self.opcoes_upload
+            ))
+        except Exception as e:
+            print(f"[ERRO] Falha no upload: {str(e)}")
+            sucesso = False
+        
+        if not sucesso:
+            print(f"[AVISO] Upload falhou; nova tentativa em {self.janela}s com varredura completa")
+            self.varredura_completa = self.varredura_completa or houve_pasta
+            self.arquivos_pendentes.update(arquivos)
+            agora = time.monotonic()
+            self.primeiro_evento = self.primeiro_evento or agora
+            self.ultimo_evento = agora
+    
+    def _iniciar_inotify(self):
+        """Cria os watches; retorna False se o inotify nao estiver disponivel"""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            self.inotify = Inotify()
+        except (OSError, AttributeError):
+            return False
+        
+        if self.pasta_origem:
+            self._observar_arvore(self.pasta_origem)
+        
+        # Arquivos individuais: observa a pasta de cada um (editores salvam
+        # trocando o arquivo, o que quebraria um watch no proprio arquivo)
+        for pasta in sorted({os.path.dirname(arquivo) for arquivo in self.arquivos}):
+            try:
+                self.pastas_por_wd[self.inotify.adicionar(pasta)] = pasta
+            except OSError as e:
+                print(f"[AVISO] Nao foi possivel observar {pasta}: {e.strerror}")
+        return True
+    
+    def iniciar(self):
+        """Observa ate Ctrl+C"""
+        print(f"[INICIO] Monitorando backup para {self.uploader.repositorio_local}")
+        if self.pasta_origem:
+            print(f"Pasta: {self.pasta_origem}")
+        if self.arquivos:
+            print(f"Arquivos individuais: {len(self.arquivos)}")
+        
+        # Sincroniza o que mudou enquanto o monitor estava parado
+        self.varredura_completa = bool(self.pasta_origem)
+        self.arquivos_pendentes = set(self.arquivos)
+        self.primeiro_evento = self.ultimo_evento = time.monotonic() - self.espera_maxima
+        
+        try:
+            if self._iniciar_inotify():
+                print(f"Modo: inotify ({len(self.pastas_por_wd)} pasta(s) observada(s)), "
+                      f"janela de {self.janela}s\n")
+                while True:
+                    if self._pronto_para_enviar():
+                        self._enviar()
+                    self._processar_eventos(self.inotify.ler(timeout=1.0))
+            else:
+                print(f"Modo: varredura a cada {self.intervalo_polling}s (inotify indisponivel)\n")
+                while True:
+                    self._enviar()
+                    time.sleep(self.intervalo_polling)
+                    self.varredura_completa = bool(self.pasta_origem)
+                    self.arquivos_pendentes = set(self.arquivos)
+        
+        except KeyboardInterrupt:
+            print("\n[FIM] Monitoramento encerrado")
+        
+        finally:
+            if self.inotify:
+                self.inotify.fechar()
+                self.inotify = None
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    uploader = GitHubAutoUpload(
+        repositorio_local="C:/Users/Usuario/automacoes-n8n-python"
+    )
+    
+    monitor = MonitorBackup(
+        uploader,
+        pasta_origem="C:/Projetos/MeuProjeto",
+        arquivos=["processar_emails.py", "monitorar_arquivos.py"],
+        janela=30,  # envia 30s depois da ultima alteracao
+        opcoes_upload={"nova_base_a_cada_dias": 7, "commit_direto": True}
+    )
+    monitor.iniciar()
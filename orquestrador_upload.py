@@ -0,0 +1,209 @@
+# ===================================================================
+# orquestrador_upload.py
+# Executa GitHubAutoUpload em varios repositorios em paralelo
+# ===================================================================
+#
+# Arquivo de configuracao (JSON):
+#
+# {
+#     "max_processos": 8,
+#     "max_pushes": 3,
+#     "pasta_logs": "logs_upload",
+#     "repositorios": [
+#         {
+#             "nome": "automacoes",
+#             "repositorio_local": "C:/Repos/automacoes-n8n-python",
+#             "branch": "main",
+#             "pasta_origem": "C:/Projetos/Automacoes",
+#             "arquivos": ["processar_emails.py"],
+#             "incremental": true
+#         }
+#     ]
+# }
+#
+# Uso: python orquestrador_upload.py config_repositorios.json
+
+import io
+import os
+import sys
+import json
+import time
+import multiprocessing
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from github_auto_upload import GitHubAutoUpload
+
+# Opcoes de cada repositorio repassadas para upload_completo
+OPCOES_UPLOAD = (
+    "pasta_origem", "arquivos", "mensagem_commit", "criar_zip_backup", "incremental",
+    "adicionar_tudo", "commit_direto", "dividir_chunks", "webhook_relatorio",
+    "tamanho_medio_chunk", "tamanho_maximo_chunk", "nova_base", "nova_base_a_cada_dias", "max_deltas"
+)
+
+# Semaforo compartilhado entre os processos (definido em _iniciar_processo)
+SEMAFORO_PUSH = None
+
+
+def _iniciar_processo(semaforo):
+    global SEMAFORO_PUSH
+    SEMAFORO_PUSH = semaforo
+
+
+def nome_repositorio(config_repo, padrao="(sem nome)"):
+    """Nome usado no resumo e no log: 'nome' ou a pasta de repositorio_local"""
+    repositorio_local = config_repo.get("repositorio_local")
+    return (config_repo.get("nome")
+            or (os.path.basename(os.path.normpath(repositorio_local)) if repositorio_local else "")
+            or padrao)
+
+
+def resultado_com_erro(nome, mensagem):
+    """Resultado de um repositorio cujo processo nao retornou"""
+    return {"nome": nome, "sucesso": False, "segundos": 0.0, "saida": f"[ERRO] {mensagem}\n", "relatorio": None}
+
+
+def executar_repositorio(config_repo):
+    """
+    Executa upload_completo para um repositorio (roda no processo filho)
+    
+    Toda a saida do uploader e capturada, para nao misturar com a dos
+    outros repositorios.
+    
+    Args:
+        config_repo: Dicionario de um item de "repositorios"
+    
+    Returns:
+        Dicionario com nome, sucesso, segundos, saida e relatorio
+    """
+    nome = nome_repositorio(config_repo)
+    saida = io.StringIO()
+    inicio = time.perf_counter()
+    relatorio = None
+    
+    try:
+        with redirect_stdout(saida), redirect_stderr(saida):
+            if not config_repo.get("repositorio_local"):
+                raise ValueError("'repositorio_local' nao informado")
+            uploader = GitHubAutoUpload(
+                repositorio_local=config_repo["repositorio_local"],
+                branch=config_repo.get("branch", "main"),
+                trava_push=SEMAFORO_PUSH
+            )
+            opcoes = {chave: config_repo[chave] for chave in OPCOES_UPLOAD if chave in config_repo}
+            relatorio = uploader.upload_completo(**opcoes)
+        sucesso = bool(relatorio)
+    
+    except Exception as e:
+        saida.write(f"\n[ERRO] {type(e).__name__}: {str(e)}\n")
+        sucesso = False
+    
+    return {
+        "nome": nome,
+        "sucesso": sucesso,
+        "segundos": time.perf_counter() - inicio,
+        "saida": saida.getvalue(),
+        "relatorio": relatorio.para_dict() if relatorio is not None else None
+    }
+
+
+def orquestrar_uploads(repositorios, max_processos=4, max_pushes=2, pasta_logs=None, mostrar_saida=False):
+    """
+    Executa upload_completo em varios repositorios ao mesmo tempo
+    
+    Args:
+        repositorios: Lista de dicionarios (repositorio_local, branch,
+                      pasta_origem, arquivos e demais opcoes de upload_completo)
+        max_processos: Quantidade de repositorios processados em paralelo
+        max_pushes: Quantidade maxima de 'git push' simultaneos
+        pasta_logs: Pasta onde a saida de cada repositorio e gravada (opcional)
+        mostrar_saida: Se True, imprime a saida completa de cada repositorio
+                       (em bloco, ao terminar)
+    
+    Returns:
+        Lista de resultados na ordem da configuracao
+    """
+    print(f"\n{'='*60}")
+    print(f"ORQUESTRADOR DE UPLOADS")
+    print(f"{'='*60}")
+    print(f"Repositorios: {len(repositorios)}")
+    print(f"Processos: {max_processos} | Pushes simultaneos: {max_pushes}\n")
+    
+    if pasta_logs:
+        os.makedirs(pasta_logs, exist_ok=True)
+    
+    contexto = multiprocessing.get_context()
+    semaforo = contexto.Semaphore(max_pushes)
+    resultados = [None] * len(repositorios)
+    
+    with ProcessPoolExecutor(max_workers=max_processos, mp_context=contexto,
+                             initializer=_iniciar_processo, initargs=(semaforo,)) as executor:
+        futuros = {
+            executor.submit(executar_repositorio, config_repo): indice
+            for indice, config_repo in enumerate(repositorios)
+        }
+        
+        for futuro in as_completed(futuros):
+            indice = futuros[futuro]
+            nome = nome_repositorio(repositorios[indice], f"repositorio_{indice + 1}")
+            try:
+                resultado = futuro.result()
+                resultado["nome"] = nome
+            except Exception as e:
+                # Processo filho encerrado (ex: falta de memoria) ou resultado nao serializavel
+                resultado = resultado_com_erro(nome, f"{type(e).__name__}: {str(e)}")
+            resultados[indice] = resultado
+            
+            if pasta_logs:
+                resultado["log"] = os.path.join(pasta_logs, f"{resultado['nome']}.log")
+                with open(resultado["log"], 'w', encoding='utf-8') as f:
+                    f.write(resultado["saida"])
+            
+            status = "[OK]" if resultado["sucesso"] else "[ERRO]"
+            print(f"{status} {resultado['nome']} ({resultado['segundos']:.1f}s)")
+            
+            if mostrar_saida:
+                print(f"{'-'*60}\n{resultado['saida'].strip()}\n{'-'*60}")
+    
+    exibir_resumo(resultados)
+    return resultados
+
+
+def exibir_resumo(resultados):
+    """Imprime a tabela final com status e tempo de cada repositorio"""
+    largura = max([len(resultado["nome"]) for resultado in resultados] + [12])
+    
+    print(f"\n{'='*60}")
+    print(f"RESUMO")
+    print(f"{'='*60}")
+    print(f"{'REPOSITORIO':<{largura}}  {'STATUS':<7} {'TEMPO':>8}")
+    for resultado in resultados:
+        status = "OK" if resultado["sucesso"] else "FALHA"
+        print(f"{resultado['nome']:<{largura}}  {status:<7} {resultado['segundos']:>7.1f}s")
+    
+    sucessos = sum(1 for resultado in resultados if resultado["sucesso"])
+    print(f"\nSucesso: {sucessos} | Falha: {len(resultados) - sucessos}")
+    print(f"{'='*60}\n")
+
+
+def carregar_configuracao(caminho_config):
+    """Le o arquivo JSON de configuracao do orquestrador"""
+    with open(caminho_config, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python orquestrador_upload.py config_repositorios.json")
+        sys.exit(2)
+    
+    config = carregar_configuracao(sys.argv[1])
+    resultados = orquestrar_uploads(
+        config["repositorios"],
+        max_processos=config.get("max_processos", 4),
+        max_pushes=config.get("max_pushes", 2),
+        pasta_logs=config.get("pasta_logs")
+    )
+    
+    sys.exit(0 if all(resultado["sucesso"] for resultado in resultados) else 1)
@@ -0,0 +1,226 @@
+# ===================================================================
+# registro.py
+# Logs estruturados (texto ou JSON), amostragem de logs por item e
+# metricas em memoria (contadores e tempos) para os scripts n8n
+# ===================================================================
+#
+# Uso:
+#   from registro import obter_logger, METRICAS, log_item
+#
+#   log = obter_logger("csv")
+#   for linha in linhas:
+#       with METRICAS.cronometro("csv.envio"):
+#           ...
+#       METRICAS.incrementar("csv.linhas_ok")
+#       log_item(log, "[OK] Linha %d processada", numero)
+#
+# Com configurar_registro(nivel="SILENCIOSO") os logs sao descartados no
+# primeiro teste de nivel e as mensagens nem chegam a ser formatadas.
+
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+# Nivel acima de CRITICAL: nada e registrado
+SILENCIOSO = logging.CRITICAL + 10
+logging.addLevelName(SILENCIOSO, "SILENCIOSO")
+
+NOME_RAIZ = "n8n"
+
+
+class FormatoJSON(logging.Formatter):
+    """Uma linha JSON por registro, com os campos passados em extra={"dados": {...}}"""
+    
+    def format(self, record):
+        registro = {
+            "ts": round(record.created, 3),
+            "nivel": record.levelname,
+            "origem": record.name,
+            "msg": record.getMessage()
+        }
+        dados = getattr(record, "dados", None)
+        if dados:
+            registro.update(dados)
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+
+class Metricas:
+    """Contadores e tempos em memoria, com ganchos de exportacao"""
+    
+    def __init__(self):
+        self.ativo = True
+        self.trava = threading.Lock()
+        self.contadores = {}
+        self.tempos = {}
+        self.exportadores = []
+        self.exportadores_trace = []
+    
+    def incrementar(self, nome, valor=1):
+        if not self.ativo:
+            return
+        with self.trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + valor
+    
+    def registrar_tempo(self, nome, segundos):
+        if not self.ativo:
+            return
+        with self.trava:
+            tempo = self.tempos.get(nome)
+            if tempo is None:
+                tempo = self.tempos[nome] = {"quantidade": 0, "total_s": 0.0, "max_s": 0.0}
+            tempo["quantidade"] += 1
+            tempo["total_s"] += segundos
+            if segundos > tempo["max_s"]:
+                tempo["max_s"] = segundos
+    
+    @contextmanager
+    def cronometro(self, nome, **atributos):
+        """
+        Mede o bloco e registra em 'nome'
+        
+        Se houver exportadores de trace, cada execucao tambem e enviada como
+        um span {"nome", "inicio", "duracao_s", **atributos}.
+        """
+        if not self.ativo:
+            yield
+            return
+        
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.registrar_tempo(nome, duracao)
+            if self.exportadores_trace:
+                span = {"nome": nome, "inicio": time.time() - duracao, "duracao_s": duracao, **atributos}
+                for exportador in self.exportadores_trace:
+                    exportador(span)
+    
+    def snapshot(self):
+        """Copia dos contadores e tempos atuais"""
+        with self.trava:
+            return {
+                "contadores": dict(self.contadores),
+                "tempos": {
+                    nome: {**tempo, "media_s": tempo["total_s"] / tempo["quantidade"]}
+                    for nome, tempo in self.tempos.items()
+                }
+            }
+    
+    def registrar_exportador(self, funcao):
+        """funcao(snapshot) e chamada em exportar()"""
+        self.exportadores.append(funcao)
+    
+    def registrar_exportador_trace(self, funcao):
+        """funcao(span) e chamada ao fim de cada cronometro"""
+        self.exportadores_trace.append(funcao)
+    
+    def exportar(self):
+        """Envia o snapshot atual para todos os exportadores"""
+        dados = self.snapshot()
+        for exportador in self.exportadores:
+            exportador(dados)
+        return dados
+    
+    def zerar(self):
+        with self.trava:
+            self.contadores.clear()
+            self.tempos.clear()
+
+
+METRICAS = Metricas()
+
+# Registra 1 a cada N logs por item (ver log_item)
+_amostragem = {"n": 1, "contagem": {}}
+
+
+class _HandlerConsole(logging.StreamHandler):
+    """Escreve no sys.stdout atual (respeita redirect_stdout)"""
+    
+    @property
+    def stream(self):
+        return sys.stdout
+    
+    @stream.setter
+    def stream(self, valor):
+        pass
+
+
+def configurar_registro(nivel="INFO", formato="texto", amostragem=1, arquivo=None, metricas=True):
+    """
+    Configura logs e metricas de todos os scripts
+    
+    Args:
+        nivel: DEBUG, INFO, WARNING, ERROR ou SILENCIOSO
+        formato: "texto" (mesmas linhas de antes) ou "json" (uma linha JSON por log)
+        amostragem: Registra 1 a cada N logs por item (erros nunca sao amostrados)
+        arquivo: Grava em arquivo em vez do console (opcional)
+        metricas: Se False, contadores e cronometros viram no-op
+    """
+    raiz = logging.getLogger(NOME_RAIZ)
+    nivel_numerico = SILENCIOSO if str(nivel).upper() == "SILENCIOSO" else logging.getLevelName(str(nivel).upper())
+    raiz.setLevel(nivel_numerico)
+    raiz.propagate = False
+    
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+        handler.close()
+    
+    handler = logging.FileHandler(arquivo, encoding="utf-8") if arquivo else _HandlerConsole()
+    handler.setFormatter(FormatoJSON() if formato == "json" else logging.Formatter("%(message)s"))
+    raiz.addHandler(handler)
+    
+    _amostragem["n"] = max(int(amostragem), 1)
+    _amostragem["contagem"] = {}
+    METRICAS.ativo = metricas
+
+
+def obter_logger(nome):
+    """
+    Retorna o logger 'n8n.<nome>'
+    
+    Sem configurar_registro, os logs saem no console como os prints
+    antigos (nivel INFO, so a mensagem).
+    """
+    raiz = logging.getLogger(NOME_RAIZ)
+    if not raiz.handlers:
+        handler = _HandlerConsole()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        raiz.addHandler(handler)
+        raiz.setLevel(logging.INFO)
+        raiz.propagate = False
+    return logging.getLogger(f"{NOME_RAIZ}.{nome}")
+
+
+def log_item(logger, msg, *args, nivel=logging.INFO, dados=None):
+    """
+    Log de item em laco (uma linha por arquivo, linha de CSV, etc)
+    
+    Respeita a amostragem configurada e sai antes de formatar a mensagem
+    quando o nivel esta desligado.
+    """
+    if not logger.isEnabledFor(nivel):
+        return
+    
+    n = _amostragem["n"]
+    if n > 1 and nivel < logging.WARNING:
+        contagem = _amostragem["contagem"]
+        atual = contagem.get(logger.name, 0)
+        contagem[logger.name] = atual + 1
+        if atual % n:
+            return
+    
+    logger.log(nivel, msg, *args, extra={"dados": dados} if dados else None)
+
+
+def exportador_json(caminho):
+    """Exportador que grava o snapshot das metricas em um arquivo JSON"""
+    
+    def exportar(dados):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=2)
+    
+    return exportar
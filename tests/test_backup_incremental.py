@@ -0,0 +1,84 @@
+# ===================================================================
+# tests/test_backup_incremental.py
+# Backup base + deltas e restauracao (inclusive no mesmo segundo)
+# ===================================================================
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from github_auto_upload import GitHubAutoUpload
+
+
+class DataFixa(datetime):
+    """Todos os backups do teste caem no mesmo segundo"""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 1, 12, 0, 0)
+
+
+class TesteBackupIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.origem = os.path.join(self.pasta.name, "origem")
+        self.repositorio = os.path.join(self.pasta.name, "repo")
+        os.makedirs(self.origem)
+        os.makedirs(self.repositorio)
+        self.uploader = GitHubAutoUpload(self.repositorio)
+        self.zips = []
+        
+        with mock.patch("github_auto_upload.datetime", DataFixa):
+            for nome in ("x", "y", "z"):
+                with open(os.path.join(self.origem, nome), 'w') as f:
+                    f.write(nome)
+                with redirect_stdout(io.StringIO()):
+                    self.zips.append(self.uploader.criar_zip_incremental(self.origem))
+    
+    def tearDown(self):
+        self.pasta.cleanup()
+    
+    def restaurar(self, ate=None):
+        destino = tempfile.mkdtemp(dir=self.pasta.name)
+        with redirect_stdout(io.StringIO()):
+            sucesso = self.uploader.restaurar_backup(destino, ate=ate)
+        return sucesso, sorted(os.listdir(destino))
+    
+    def test_backups_no_mesmo_segundo_tem_nomes_diferentes(self):
+        nomes = [os.path.basename(caminho) for caminho in self.zips]
+        self.assertEqual(nomes, [
+            "backup_base_20250101_120000.zip",
+            "backup_delta_20250101_120000.zip",
+            "backup_delta_20250101_120000_2.zip"
+        ])
+        cadeia = self.uploader.carregar_manifesto()["cadeia"]
+        self.assertEqual([entrada["arquivo"] for entrada in cadeia], nomes)
+    
+    def test_restaura_base_e_todos_os_deltas(self):
+        self.assertEqual(self.restaurar(), (True, ["x", "y", "z"]))
+    
+    def test_restaura_ate_um_zip_pelo_nome(self):
+        self.assertEqual(self.restaurar("backup_base_20250101_120000.zip"), (True, ["x"]))
+        self.assertEqual(self.restaurar("backup_delta_20250101_120000.zip"), (True, ["x", "y"]))
+    
+    def test_nome_ou_timestamp_inexistente_e_erro(self):
+        self.assertFalse(self.restaurar("nao_existe.zip")[0])
+        self.assertFalse(self.restaurar("20240101_000000")[0])
+    
+    def test_exclusoes_sao_aplicadas(self):
+        os.remove(os.path.join(self.origem, "y"))
+        with redirect_stdout(io.StringIO()):
+            self.uploader.criar_zip_incremental(self.origem)
+        self.assertEqual(self.restaurar(), (True, ["x", "z"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
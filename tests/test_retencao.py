@@ -0,0 +1,122 @@
+# ===================================================================
+# tests/test_retencao.py
+# Politica de retencao com cadeias incrementais e outros tipos de backup
+# ===================================================================
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from github_auto_upload import GitHubAutoUpload, PoliticaRetencao
+
+
+class TesteRetencao(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.repositorio = self.pasta.name
+    
+    def tearDown(self):
+        self.pasta.cleanup()
+    
+    def criar(self, *nomes):
+        for nome in nomes:
+            with open(os.path.join(self.repositorio, nome), 'wb') as f:
+                f.write(b"x")
+    
+    def aplicar(self, **politica):
+        uploader = GitHubAutoUpload(self.repositorio, retencao=PoliticaRetencao(**politica))
+        with redirect_stdout(io.StringIO()):
+            uploader.aplicar_retencao(agora=datetime(2025, 2, 1))
+        return sorted(os.listdir(self.repositorio))
+    
+    def test_backup_completo_no_meio_da_cadeia_nao_separa_base_e_delta(self):
+        self.criar(
+            "backup_base_20250101_000000.zip",
+            "backup_20250102_000000.zip",
+            "backup_delta_20250103_000000.zip"
+        )
+        
+        self.assertEqual(self.aplicar(ultimos=1), [
+            "backup_base_20250101_000000.zip",
+            "backup_delta_20250103_000000.zip"
+        ])
+    
+    def test_indice_de_chunks_no_meio_da_cadeia_nao_separa_base_e_delta(self):
+        self.criar(
+            "backup_base_20250101_000000.zip",
+            "backup_20250102_000000.indice.json",
+            "backup_delta_20250103_000000.zip",
+            "backup_delta_20250104_000000.zip"
+        )
+        
+        self.assertEqual(self.aplicar(ultimos=1), [
+            "backup_base_20250101_000000.zip",
+            "backup_delta_20250103_000000.zip",
+            "backup_delta_20250104_000000.zip"
+        ])
+    
+    def test_tipos_diferentes_com_o_mesmo_timestamp(self):
+        self.criar(
+            "backup_base_20250101_000000.zip",
+            "backup_20250101_000000.zip",
+            "backup_delta_20250102_000000.zip"
+        )
+        
+        self.assertEqual(self.aplicar(ultimos=1), [
+            "backup_base_20250101_000000.zip",
+            "backup_delta_20250102_000000.zip"
+        ])
+    
+    def test_cadeia_antiga_sai_inteira_depois_de_nova_base(self):
+        self.criar(
+            "backup_base_20250101_000000.zip",
+            "backup_delta_20250102_000000.zip",
+            "backup_delta_20250103_000000.zip",
+            "backup_base_20250104_000000.zip",
+            "backup_delta_20250105_000000.zip",
+            "backup_delta_20250106_000000.zip"
+        )
+        
+        self.assertEqual(self.aplicar(ultimos=2), [
+            "backup_base_20250104_000000.zip",
+            "backup_delta_20250105_000000.zip",
+            "backup_delta_20250106_000000.zip"
+        ])
+
+
+class TesteNovaBase(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.uploader = GitHubAutoUpload(self.pasta.name)
+    
+    def tearDown(self):
+        self.pasta.cleanup()
+    
+    def manifesto(self, timestamp_base, deltas):
+        cadeia = [{"arquivo": "base.zip", "tipo": "base", "timestamp": timestamp_base}]
+        cadeia += [{"arquivo": f"delta_{i}.zip", "tipo": "delta", "timestamp": timestamp_base}
+                   for i in range(deltas)]
+        return {"arquivos": {}, "cadeia": cadeia}
+    
+    def test_max_deltas(self):
+        self.assertFalse(self.uploader._cadeia_vencida(self.manifesto("20990101_000000", 2), max_deltas=3))
+        self.assertTrue(self.uploader._cadeia_vencida(self.manifesto("20990101_000000", 3), max_deltas=3))
+    
+    def test_idade_da_base(self):
+        self.assertTrue(self.uploader._cadeia_vencida(self.manifesto("20000101_000000", 0), nova_base_a_cada_dias=7))
+        self.assertFalse(self.uploader._cadeia_vencida(self.manifesto("20990101_000000", 0), nova_base_a_cada_dias=7))
+    
+    def test_sem_limites(self):
+        self.assertFalse(self.uploader._cadeia_vencida(self.manifesto("20000101_000000", 50)))
+
+
+if __name__ == "__main__":
+    unittest.main()